@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Subtitle Maker - Benchmarks
+
+Runs fully offline: inputs are synthetic, and SubtitleMaker.recognizer and
+SubtitleMaker.translator are swapped for local fakes with configurable
+latency, jitter and failure rate. Results are printed (and optionally
+saved) as JSON so they can be compared between commits.
+
+usage
+
+  python benchmark.py pipeline [--seconds 600] [--format wav|mp3] [--segment 10]
+                               [--workers N] [--latency 0.3] [--jitter 0.1]
+                               [--failure-rate 0] [--quota N] [--rate-limit N] [--max-retries 5]
+                               [--language en-US] [--decode wav] [--vad] [--segmentation fixed|pause]
+                               [--backend google|sphinx|vosk|fake] [--repeat 1]
+                               [--output result.json]
+  python benchmark.py payload [--seconds 600] [--segment 10] [--rate 44100] [--channels 2]
+  python benchmark.py startup [--repeat 20]
+  python benchmark.py compare <baseline.json> <candidate.json>
+
+  pipeline  run process_audio end to end and report wall time, audio-seconds
+            per second, peak RSS and a per-stage breakdown
+  payload   time building one recognizer payload per segment: the old
+            export-to-temp.wav/re-read path against the in-memory path
+  startup   time fresh interpreters importing submaker_enhanced and printing
+            its usage, and list the heavy dependencies each one imported
+  compare   show the relative change of every numeric field between two runs
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import random
+import shutil
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import speech_recognition as sr
+from pydub import AudioSegment
+
+from submaker_enhanced import GOVERNOR_MAX_RETRIES, RECOGNIZER_BACKENDS, SEGMENTATION_MODES, SubtitleMaker
+
+# Phrases the fake recognizer returns; a small vocabulary makes repeats common,
+# as they are in real speech ("thank you", "okay")
+FAKE_PHRASES = ("thank you", "okay", "see you tomorrow", "what happened here",
+                "we should leave now", "that is not what I meant")
+
+
+def make_tone_audio(seconds, rate=44100, channels=2, burst=4, gap=3):
+    """Speech-like test signal: 220 Hz tone bursts separated by silence"""
+    t = np.arange(int(seconds * rate)) / rate
+    signal = np.where((t % (burst + gap)) < burst, 0.3 * np.sin(2 * np.pi * 220 * t), 0.0)
+    pcm = (signal * 32767).astype(np.int16)
+    if channels > 1:
+        pcm = np.repeat(pcm[:, None], channels, axis=1)
+    return AudioSegment(pcm.tobytes(), frame_rate=rate, sample_width=2, channels=channels)
+
+
+def write_synthetic_input(path, seconds, rate=44100, channels=2, burst=4, gap=3):
+    """Write a tone-burst test file; MP3 (or any non-WAV extension) is encoded with ffmpeg"""
+    audio = make_tone_audio(seconds, rate, channels, burst, gap)
+    wav_path = path if path.endswith(".wav") else path + ".tmp.wav"
+    with wave.open(wav_path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(audio.raw_data)
+    if wav_path != path:
+        subprocess.run(['ffmpeg', '-loglevel', 'error', '-y', '-i', wav_path, path], check=True)
+        os.remove(wav_path)
+    return path
+
+
+class FakeLatency:
+    """Simulated remote call: sleeps latency +/- jitter and fails at a given rate
+
+    With ``quota`` (calls per second) the fake also rejects calls beyond the
+    quota over the last second, like a throttling service.
+    """
+
+    def __init__(self, latency=0.3, jitter=0.1, failure_rate=0.0, seed=0, quota=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.quota = quota
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.calls = 0
+        self.failures = 0
+        self.throttled = 0
+        self.busy_seconds = 0.0
+
+    def call(self, error_type):
+        with self.lock:
+            now = time.monotonic()
+            while self.recent and now - self.recent[0] >= 1.0:
+                self.recent.popleft()
+            self.calls += 1
+            if self.quota and len(self.recent) >= self.quota:
+                self.throttled += 1
+                raise error_type("quota exceeded")
+            self.recent.append(now)
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            fail = self.random.random() < self.failure_rate
+            self.busy_seconds += delay
+            if fail:
+                self.failures += 1
+        time.sleep(delay)
+        if fail:
+            raise error_type("injected failure")
+
+    def stats(self):
+        return {"calls": self.calls, "failures": self.failures, "throttled": self.throttled,
+                "busy_seconds": self.busy_seconds}
+
+
+class FakeRecognizer(sr.Recognizer):
+    """Offline stand-in for recognize_google; silent payloads raise UnknownValueError"""
+
+    def __init__(self, latency=0.3, jitter=0.1, failure_rate=0.0, seed=0, quota=None):
+        super().__init__()
+        self.remote = FakeLatency(latency, jitter, failure_rate, seed, quota)
+
+    def recognize_google(self, audio_data, key=None, language="en-US", **kwargs):
+        self.remote.call(sr.RequestError)
+        samples = np.frombuffer(audio_data.get_raw_data(convert_width=2), dtype=np.int16)
+        if len(samples) == 0 or np.abs(samples).max() < 100:
+            raise sr.UnknownValueError()
+        return FAKE_PHRASES[int(np.abs(samples[::97]).sum()) % len(FAKE_PHRASES)]
+
+
+class FakeTranslation:
+    def __init__(self, text, dest):
+        self.text = f"[{dest}] {text}"
+
+
+class FakeTranslator:
+    """Offline stand-in for googletrans.Translator; accepts a string or a list"""
+
+    def __init__(self, latency=0.1, jitter=0.05, failure_rate=0.0, seed=1):
+        self.remote = FakeLatency(latency, jitter, failure_rate, seed)
+
+    def translate(self, text, dest="en", src="auto"):
+        self.remote.call(RuntimeError)
+        if isinstance(text, list):
+            return [FakeTranslation(item, dest) for item in text]
+        return FakeTranslation(text, dest)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.decode().strip()
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return None
+
+
+def run_pipeline(config):
+    """Run process_audio once on a synthetic input; meant to run in a fresh process"""
+    work_dir = tempfile.mkdtemp(prefix="submaker-bench-")
+    try:
+        input_file = write_synthetic_input(os.path.join(work_dir, f"input.{config['format']}"),
+                                           config["seconds"], config["rate"], config["channels"])
+        maker = SubtitleMaker()
+        maker.recognizer = FakeRecognizer(config["latency"], config["jitter"], config["failure_rate"],
+                                          quota=config["quota"])
+        maker.translator = FakeTranslator(config["translate_latency"], config["jitter"] / 2,
+                                          config["failure_rate"])
+        maker.use_backend(config["backend"])
+        maker.workers = config["workers"]
+        maker.decode_mode = config["decode"]
+        maker.vad_enabled = config["vad"]
+        maker.segmentation = config["segmentation"]
+        maker.cache_enabled = False
+        maker.history_enabled = False
+        maker.recognize_governor.rate = config["rate_limit"]
+        maker.recognize_governor.max_retries = config["max_retries"]
+        maker.translate_governor.max_retries = config["max_retries"]
+
+        events = {}
+
+        def callback(message_type, message):
+            events[message_type] = events.get(message_type, 0) + 1
+
+        started = time.perf_counter()
+        ok = maker.process_audio(input_file, config["language"], config["segment"], callback=callback)
+        wall = time.perf_counter() - started
+
+        audio_seconds = maker.audio_duration or config["seconds"]
+        metrics = maker.metrics.snapshot()
+        return {
+            "ok": bool(ok),
+            "wall_seconds": wall,
+            "audio_seconds": audio_seconds,
+            "audio_seconds_per_second": audio_seconds / wall,
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": {stage: values["seconds"] for stage, values in metrics["stages"].items()},
+            "counters": metrics["counters"],
+            "errors": metrics["errors"],
+            "fakes": {"recognize": maker.recognizer.remote.stats(),
+                      "translate": maker.translator.remote.stats()},
+            "callback_events": events,
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_pipeline(config, repeat=1):
+    """Run the pipeline benchmark ``repeat`` times, each in its own process"""
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            runs.append(executor.submit(run_pipeline, config).result())
+    best = min(runs, key=lambda run: run["wall_seconds"])
+    return dict(best, benchmark="pipeline", config=config, revision=git_revision(),
+                runs=[run["wall_seconds"] for run in runs])
+
+
+def segment_bounds(length_ms, segment_length):
+    """Fixed-grid [start, end) boundaries in milliseconds, as process_audio cuts them"""
+    step = segment_length * 1000
+    return [(start, min(start + step, length_ms)) for start in range(0, length_ms - step + 1, step)]
+
+
+def bench_payload(seconds, segment_length, rate, channels):
+    """Per-segment cost of the temp.wav round trip versus in-memory payloads"""
+    whole_audio = make_tone_audio(seconds, rate, channels)
+    bounds = segment_bounds(len(whole_audio), segment_length)
+    recognizer = sr.Recognizer()
+    maker = SubtitleMaker()
+
+    temp_dir = tempfile.mkdtemp()
+    temp_wav = os.path.join(temp_dir, "temp.wav")
+    started = time.perf_counter()
+    for start, end in bounds:
+        whole_audio[start:end].export(temp_wav, format="wav")
+        with sr.AudioFile(temp_wav) as source:
+            recognizer.record(source)
+    file_time = time.perf_counter() - started
+    os.remove(temp_wav)
+    os.rmdir(temp_dir)
+
+    started = time.perf_counter()
+    samples, sample_rate = maker.load_samples(whole_audio)
+    for start, end in bounds:
+        maker.segment_audio_data(samples, sample_rate, start, end)
+    memory_time = time.perf_counter() - started
+
+    segments = len(bounds)
+    return {
+        "benchmark": "payload",
+        "revision": git_revision(),
+        "audio_seconds": seconds,
+        "segment_length": segment_length,
+        "sample_rate": rate,
+        "channels": channels,
+        "segments": segments,
+        "temp_wav_ms_per_segment": 1000 * file_time / segments,
+        "in_memory_ms_per_segment": 1000 * memory_time / segments,
+        "saved_ms_per_segment": 1000 * (file_time - memory_time) / segments,
+    }
+
+
+# Start-up scenarios: a bare import, and the command line's usage message
+STARTUP_COMMANDS = {
+    "import": ["-c", "import submaker_enhanced"],
+    "usage": ["submaker_enhanced.py", "--usage"],
+}
+
+# Dependencies whose import the start-up benchmark reports on
+HEAVY_MODULES = ("tkinter", "googletrans", "speech_recognition", "pydub", "numpy")
+
+
+def parse_importtime(stderr):
+    """{module: cumulative microseconds} for top-level imports in ``-X importtime`` output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def bench_startup(repeat=20):
+    """Wall time of fresh interpreter start-ups and which heavy modules they import"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    scenarios = {}
+    for scenario, command in STARTUP_COMMANDS.items():
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            subprocess.run([sys.executable] + command, cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - started)
+        traced = subprocess.run([sys.executable, "-X", "importtime"] + command, cwd=here, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, universal_newlines=True)
+        modules = parse_importtime(traced.stderr)
+        slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+        scenarios[scenario] = {
+            "wall_ms_min": 1000 * min(times),
+            "wall_ms_mean": 1000 * sum(times) / len(times),
+            "import_ms": sum(modules.values()) / 1000,
+            "heavy_modules": [name for name in HEAVY_MODULES if name in modules],
+            "slowest_imports_ms": {name: cumulative / 1000 for name, cumulative in slowest},
+        }
+    return {"benchmark": "startup", "revision": git_revision(), "repeat": repeat, "scenarios": scenarios}
+
+
+def flatten(result, prefix=""):
+    """Numeric leaves of a result as {"a.b.c": value}"""
+    values = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[prefix + key] = value
+    return values
+
+
+def compare(baseline_file, candidate_file):
+    """Print every numeric field of two saved results with its relative change"""
+    with open(baseline_file, encoding="utf-8") as f:
+        baseline = flatten(json.load(f))
+    with open(candidate_file, encoding="utf-8") as f:
+        candidate = flatten(json.load(f))
+    width = max(len(key) for key in baseline) if baseline else 10
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        change = f"{100 * (new - old) / old:+.1f}%" if old else "n/a"
+        print(f"{key:<{width}}  {old:>12.4g}  {new:>12.4g}  {change:>8}")
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Subtitle Maker benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark")
+
+    pipeline = subparsers.add_parser("pipeline", help="end-to-end process_audio with fake services")
+    pipeline.add_argument("--seconds", type=int, default=600)
+    pipeline.add_argument("--format", choices=("wav", "mp3"), default="wav")
+    pipeline.add_argument("--rate", type=int, default=44100)
+    pipeline.add_argument("--channels", type=int, default=2)
+    pipeline.add_argument("--segment", type=int, default=10)
+    pipeline.add_argument("--workers", type=int, help="default: 4, or the CPU count for offline backends")
+    pipeline.add_argument("--latency", type=float, default=0.3, help="recognizer latency in seconds")
+    pipeline.add_argument("--translate-latency", type=float, default=0.1)
+    pipeline.add_argument("--jitter", type=float, default=0.1)
+    pipeline.add_argument("--failure-rate", type=float, default=0.0)
+    pipeline.add_argument("--quota", type=int, help="fake recognizer rejects calls beyond this many per second")
+    pipeline.add_argument("--rate-limit", type=float, help="recognition requests per second sent by the pipeline")
+    pipeline.add_argument("--max-retries", type=int, default=GOVERNOR_MAX_RETRIES)
+    pipeline.add_argument("--language", default="en-US")
+    pipeline.add_argument("--decode", default="wav")
+    pipeline.add_argument("--vad", action="store_true")
+    pipeline.add_argument("--segmentation", choices=SEGMENTATION_MODES, default="fixed")
+    pipeline.add_argument("--backend", choices=sorted(RECOGNIZER_BACKENDS), default="google",
+                          help="google goes to the fake recognizer; the others run locally")
+    pipeline.add_argument("--repeat", type=int, default=1)
+    pipeline.add_argument("--output", help="also write the JSON result to this file")
+
+    payload = subparsers.add_parser("payload", help="segment payload construction")
+    payload.add_argument("--seconds", type=int, default=600)
+    payload.add_argument("--segment", type=int, default=10)
+    payload.add_argument("--rate", type=int, default=44100)
+    payload.add_argument("--channels", type=int, default=2)
+    payload.add_argument("--output", help="also write the JSON result to this file")
+
+    startup = subparsers.add_parser("startup", help="interpreter start-up and import cost")
+    startup.add_argument("--repeat", type=int, default=20)
+    startup.add_argument("--output", help="also write the JSON result to this file")
+
+    comparison = subparsers.add_parser("compare", help="compare two saved results")
+    comparison.add_argument("baseline")
+    comparison.add_argument("candidate")
+    options = parser.parse_args(args)
+
+    if options.benchmark == "pipeline":
+        config = {name: getattr(options, name) for name in (
+            "seconds", "format", "rate", "channels", "segment", "workers", "latency", "translate_latency",
+            "jitter", "failure_rate", "quota", "rate_limit", "max_retries", "language", "decode", "vad",
+            "segmentation", "backend")}
+        result = bench_pipeline(config, options.repeat)
+    elif options.benchmark == "payload":
+        result = bench_payload(options.seconds, options.segment, options.rate, options.channels)
+    elif options.benchmark == "startup":
+        result = bench_startup(options.repeat)
+    elif options.benchmark == "compare":
+        compare(options.baseline, options.candidate)
+        return 0
+    else:
+        parser.print_help()
+        return 1
+
+    print(json.dumps(result, indent=2))
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -33,40 +33,42 @@ import numpy as np
 from tqdm import tqdm
 import sys
 import subprocess
+import shutil
+import tempfile
+import random
+import time
 from fnmatch import fnmatch
 
-from googletrans import Translator
-translator = Translator()
+# googletrans is only imported for non-English runs, on first use
+translator = None
 
 
 loc =  sys.argv[1] #'/media/sf_dive/FFOutput/d4.mp3' #sys.argv[1]
 lang = sys.argv[2] #'ta' #sys.argv[2]
 cut =  int(sys.argv[3]) #10 #int(sys.argv[3])
+retries = 5
 
 #alternates = sys.argv[4].split(',')
 
-if os.name == 'posix':
-    s = '/'
-    os.chdir(s.join(loc.split('/')[:-1]))
-    inputfile = loc.split('/')[-1]
-    fn ="%s.srt"%inputfile.split('.')[0]
+# absolute paths and a private temp directory, no chdir, so runs can't collide
+inputfile = os.path.abspath(loc)
+inputdir = os.path.dirname(inputfile)
+fn = os.path.join(inputdir, "%s.srt"%os.path.basename(inputfile).split('.')[0])
+tempdir = tempfile.mkdtemp(prefix="submaker-")
+transcript = os.path.join(tempdir, 'transcript.wav')
 
-elif os.name == 'nt':
-    s = '\\'
-    os.chdir(s.join(loc.split('\\')[:-1]))
-    inputfile = loc.split('\\')[-1]
-    fn ="%s.srt"%inputfile.split('.')[0]
+if inputfile.split('.')[-1].lower() != 'wav':
+    subprocess.call(['ffmpeg', '-i', inputfile, transcript])
+else:
+    transcript = inputfile
 
-    
-os.remove('transcript.wav') if os.path.exists('transcript.wav') else None
-
-if inputfile.split('.')[1] != 'wav':subprocess.call(['ffmpeg', '-i', inputfile,'transcript.wav'])
-
-wholeaudio = AudioSegment.from_wav("transcript.wav")
+wholeaudio = AudioSegment.from_wav(transcript).set_channels(1).set_sample_width(2)
 wholelen = len(wholeaudio)
+shutil.rmtree(tempdir, ignore_errors=True)
 
 os.remove(fn) if os.path.exists(fn) else None
-os.remove("translated.srt") if os.path.exists("translated.srt") else None
+os.remove(os.path.join(inputdir, "translated.srt")) if os.path.exists(os.path.join(inputdir, "translated.srt")) else None
+out = open(fn, "a")
 
 for seq,t1t,t2t in tqdm(zip(range(1,int(wholelen/(cut*1000))+1),np.arange(0, round(wholelen/cut), cut), np.arange(cut, round(wholelen/cut), cut)), total=int(wholelen/(cut*1000)), unit = "segment" ):
     #print(t1*1000,t2*1000, t2*1000-t1*1000)
@@ -80,34 +82,39 @@ for seq,t1t,t2t in tqdm(zip(range(1,int(wholelen/(cut*1000))+1),np.arange(0, rou
     #AUDIO_FILE = "transcript.wav"
     #wholeaudio = AudioSegment.from_wav("transcript.wav")
     newAudio = wholeaudio[t1:t2]
-    newAudio.export('temp.wav', format="wav")
-
-    newfile = 'temp.wav'
-    # use the audio file as the audio source                                        
+    # hand the sliced PCM frames to the recognizer directly, no temp.wav
     r = sr.Recognizer()
     
-    with sr.AudioFile(newfile) as source:
-        audio = r.record(source)  # read the entire audio file                  
-        
-        #print("\n%d\n00:00:00,%d --> 00:00:00,%d"%(seq,t1,t2),file=open("output.srt", "a"))
+    audio = sr.AudioData(newAudio.raw_data, newAudio.frame_rate, newAudio.sample_width)
+    
+    #print("\n%d\n00:00:00,%d --> 00:00:00,%d"%(seq,t1,t2),file=open("output.srt", "a"))
+    # request/translation errors are retried with exponential backoff and jitter
+    for attempt in range(retries + 1):
         try:
             
             #print(r.recognize_google(audio, language="ta-IN"),file=open("output.srt", "a"))
             if fnmatch(lang,'en*'):
                 trans = r.recognize_google(audio, language=lang)
-                print("\n%d\n00:00:00,%d --> 00:00:00,%d"%(seq,t1,t2),file=open(fn, "a"))
-                print(trans,file=open(fn, "a"))
+                print("\n%d\n00:00:00,%d --> 00:00:00,%d\n%s"%(seq,t1,t2,trans),file=out)
             else:
+                if translator is None:
+                    from googletrans import Translator
+                    translator = Translator()
                 trans=translator.translate(r.recognize_google(audio, language=lang)).text
-                print("\n%d\n00:00:00,%d --> 00:00:00,%d"%(seq,t1,t2),file=open(fn, "a"))
-                print(trans,file=open(fn, "a"))
+                print("\n%d\n00:00:00,%d --> 00:00:00,%d\n%s"%(seq,t1,t2,trans),file=out)
                 #en-US - English, US
                 #en-IN - English, India
                 #en-GB - English, UK
                 #vi-VN - Vietnamese, Vietnam
                 #ta-IN - Tamil, India
                 #es-MX - Spanish, Mexico
-        except:
-            pass
-
+            break
+        except sr.UnknownValueError:
+            break  # no speech in this segment
+        except Exception as e:
+            if attempt == retries:
+                print("Segment %d failed after %d attempts: %s" % (seq, attempt + 1, e))
+            else:
+                time.sleep(random.uniform(0, min(16, 0.5 * 2 ** attempt)))
 
+out.close()
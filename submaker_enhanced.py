@@ -18,23 +18,65 @@ This tool converts audio files to subtitles by:
 
 Requirements:
 - ffmpeg must be installed and in PATH (https://ffmpeg.org/download.html)
-- Required Python packages: speech_recognition, pydub, numpy, tqdm, 
-  googletrans==4.0.0-rc1, tkinter
+- Required Python packages: speech_recognition, pydub, numpy,
+  googletrans==4.0.0-rc1 (only for translation), tkinter (only for the GUI)
 """
 
 import os
 import sys
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import math
+import sqlite3
 import subprocess
 import threading
 import time
-from datetime import timedelta
-import tkinter as tk
-from tkinter import filedialog, ttk, messagebox, StringVar
-import speech_recognition as sr
-from pydub import AudioSegment
-import numpy as np
-from tqdm import tqdm
-from googletrans import Translator
+import queue
+import random
+import re
+import shutil
+import tempfile
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+
+class LazyImport:
+    """Stand-in for a module, or one of its attributes, that imports it and replaces itself on first use"""
+    
+    def __init__(self, name, module, attribute=None):
+        self.name = name
+        self.module = module
+        self.attribute = attribute
+        
+    def load(self):
+        value = importlib.import_module(self.module)
+        if self.attribute:
+            value = getattr(value, self.attribute)
+        globals()[self.name] = value
+        return value
+    
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+    
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+sr = LazyImport("sr", "speech_recognition")
+np = LazyImport("np", "numpy")
+AudioSegment = LazyImport("AudioSegment", "pydub", "AudioSegment")
+Translator = LazyImport("Translator", "googletrans", "Translator")
+
+
+def import_tkinter():
+    """Import tkinter for the GUI; the command line never loads it"""
+    global tk, filedialog, ttk, messagebox, StringVar
+    import tkinter as tk
+    from tkinter import filedialog, ttk, messagebox, StringVar
 
 # Language mapping for reference
 LANGUAGE_MAP = {
@@ -57,40 +99,1151 @@ LANGUAGE_MAP = {
     "Vietnamese": "vi-VN",
 }
 
+# File types picked up when a directory is given to batch mode
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg", ".m4a", ".flac")
+
+# Recognizer payloads are mono 16-bit PCM
+SAMPLE_WIDTH = 2
+
+# Number of segments kept in flight with the recognition service by default
+DEFAULT_WORKERS = 4
+
+# How the input is decoded: "wav" converts to a temporary WAV and loads it
+# whole; "stream" reads PCM from an ffmpeg pipe one segment at a time;
+# "seek" decodes each segment independently, several ffmpeg processes at once
+DECODE_MODES = ("wav", "stream", "seek")
+
+# Sample rate of the audio prepared for the recognizer; speech recognition
+# gains nothing from more, and every extra sample is uploaded
+RECOGNIZER_SAMPLE_RATE = 16000
+
+# Voice activity pre-filter: frames louder than the threshold (dBFS) count as
+# speech, and segments with too small a share of speech frames are skipped
+VAD_FRAME_MS = 30
+VAD_THRESHOLD_DB = -40.0
+VAD_MIN_SPEECH_RATIO = 0.1
+
+# How audio is cut into recognition requests: "fixed" uses the segment_length
+# grid; "pause" cuts at the first pause (a silence of at least PAUSE_MIN_MS
+# below the VAD threshold) after segment_length, stretching a request to at
+# most PAUSE_MAX_STRETCH times that length to reach one. Silences longer than
+# PAUSE_MAX_GAP seconds always end a request and are not sent, and each cue
+# keeps up to PAUSE_PADDING_MS of the surrounding silence
+SEGMENTATION_MODES = ("fixed", "pause")
+PAUSE_MIN_MS = 300
+PAUSE_MAX_STRETCH = 1.5
+PAUSE_MAX_GAP = 3.0
+PAUSE_PADDING_MS = 150
+
+
+# Recognition results cached on disk, least recently used entries evicted first
+DEFAULT_CACHE_ENTRIES = 100000
+
+# Dry-run planning (--plan): the energy scan decodes PLAN_SAMPLE_SEGMENTS grid
+# segments spread over the input, and without recorded history a recognition
+# call is assumed to take PLAN_DEFAULT_LATENCY seconds. Finished runs are
+# folded into the latency history with weight HISTORY_WEIGHT
+PLAN_SAMPLE_SEGMENTS = 24
+PLAN_DEFAULT_LATENCY = 1.0
+HISTORY_WEIGHT = 0.3
+
+# Translation requests are grouped into batches of up to this many distinct
+# strings, waiting at most TRANSLATION_BATCH_WAIT seconds for a batch to fill
+TRANSLATION_BATCH_SIZE = 32
+TRANSLATION_BATCH_WAIT = 0.2
+TRANSLATION_MEMO_ENTRIES = 10000
+
+
+# Remote calls are retried up to GOVERNOR_MAX_RETRIES times, waiting an
+# exponential backoff with jitter (seconds) between attempts; at most
+# GOVERNOR_RETRY_QUEUE calls wait to retry at once
+GOVERNOR_MAX_RETRIES = 5
+GOVERNOR_BACKOFF_BASE = 0.5
+GOVERNOR_BACKOFF_MAX = 16.0
+GOVERNOR_RETRY_QUEUE = 32
+
+
+# Live mode: each segment lasts the latency budget minus the recent
+# recognition latency (seconds), kept between the minimum and maximum length
+LIVE_LATENCY_BUDGET = 5.0
+LIVE_MIN_SEGMENT = 1.0
+LIVE_MAX_SEGMENT = 15.0
+LIVE_INITIAL_LATENCY = 1.0
+
+
+# Pipeline metrics: "metrics" callback events are sent at most this often
+# (seconds), and throughput/ETA are computed over the last N finished segments
+METRICS_INTERVAL = 1.0
+METRICS_WINDOW = 50
+
+
+# GUI: worker events are queued and applied on the Tk thread every
+# GUI_REFRESH_MS milliseconds; the status log keeps the last GUI_LOG_LINES lines
+GUI_REFRESH_MS = 50
+GUI_LOG_LINES = 1000
+
+
+# Subtitle output: cues are buffered and written every SUBTITLE_FLUSH_EVERY
+# cues (0 means once, when the run finishes)
+SUBTITLE_FORMATS = ("srt", "vtt", "json")
+SUBTITLE_FLUSH_EVERY = 50
+
+
+class DecodeError(Exception):
+    """Raised when ffmpeg fails while streaming PCM"""
+    pass
+
+
+class AudioProfile:
+    """How ffmpeg prepares audio for the recognizer: mono PCM, sample rate, band limits, normalization"""
+    
+    def __init__(self, sample_rate=RECOGNIZER_SAMPLE_RATE, highpass=None, lowpass=None, normalize=False):
+        self.sample_rate = sample_rate
+        self.highpass = highpass
+        self.lowpass = lowpass
+        self.normalize = normalize
+        
+    def filters(self):
+        """ffmpeg audio filters for the optional band-limiting and normalization"""
+        filters = []
+        if self.highpass:
+            filters.append(f"highpass=f={self.highpass}")
+        if self.lowpass:
+            filters.append(f"lowpass=f={self.lowpass}")
+        if self.normalize:
+            filters.append("dynaudnorm")
+        return filters
+    
+    def ffmpeg_args(self, sample_rate=None):
+        """Output options that apply this profile, optionally forcing ``sample_rate``"""
+        args = ['-ac', '1']
+        sample_rate = sample_rate or self.sample_rate
+        if sample_rate:
+            args += ['-ar', str(sample_rate)]
+        filters = self.filters()
+        if filters:
+            args += ['-af', ','.join(filters)]
+        return args
+    
+    def describe(self):
+        """Short description for status messages, e.g. ``mono 16000 Hz 16-bit``"""
+        parts = [f"mono {self.sample_rate} Hz 16-bit" if self.sample_rate else "mono 16-bit, source rate"]
+        if self.highpass:
+            parts.append(f"highpass {self.highpass} Hz")
+        if self.lowpass:
+            parts.append(f"lowpass {self.lowpass} Hz")
+        if self.normalize:
+            parts.append("normalized")
+        return ", ".join(parts)
+
+
+def format_timestamp(milliseconds, separator=","):
+    """Format milliseconds as HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (WebVTT)"""
+    seconds, milliseconds = divmod(int(milliseconds), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+class Cue:
+    """One subtitle: sequence number, start/end in milliseconds and text"""
+    
+    __slots__ = ("index", "start", "end", "text")
+    
+    def __init__(self, index, start, end, text):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.text = text
+        
+    def to_dict(self):
+        return {"index": self.index, "start": self.start, "end": self.end, "text": self.text}
+
+
+class SubtitleWriter:
+    """Subtitle writer flushing every ``flush_every`` cues; subclasses format header, cues and footer"""
+    
+    extension = None
+    
+    def __init__(self, path, flush_every=SUBTITLE_FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self.pending = []
+        self.count = 0
+        self.file = open(path, "w", encoding="utf-8")
+        self.pending.append(self.header())
+        
+    def header(self):
+        return ""
+    
+    def format_cue(self, cue):
+        raise NotImplementedError
+    
+    def footer(self):
+        return ""
+    
+    def write(self, cue):
+        self.pending.append(self.format_cue(cue))
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.flush()
+            
+    def flush(self):
+        self.file.write("".join(self.pending))
+        self.file.flush()
+        self.pending = []
+        
+    def close(self):
+        if self.file is None:
+            return
+        self.pending.append(self.footer())
+        self.flush()
+        self.file.close()
+        self.file = None
+
+
+class SrtWriter(SubtitleWriter):
+    extension = "srt"
+    
+    def format_cue(self, cue):
+        return (f"{cue.index}\n{format_timestamp(cue.start)} --> "
+                f"{format_timestamp(cue.end)}\n{cue.text}\n\n")
+
+
+class VttWriter(SubtitleWriter):
+    extension = "vtt"
+    
+    def header(self):
+        return "WEBVTT\n\n"
+    
+    def format_cue(self, cue):
+        return (f"{cue.index}\n{format_timestamp(cue.start, '.')} --> "
+                f"{format_timestamp(cue.end, '.')}\n{cue.text}\n\n")
+
+
+class JsonWriter(SubtitleWriter):
+    """Writes a JSON array of {index, start, end, text} objects (times in ms)"""
+    
+    extension = "json"
+    
+    def header(self):
+        return "["
+    
+    def format_cue(self, cue):
+        separator = "\n  " if self.count == 0 else ",\n  "
+        return separator + json.dumps(cue.to_dict(), ensure_ascii=False)
+    
+    def footer(self):
+        return "\n]\n" if self.count else "]\n"
+
+
+SUBTITLE_WRITERS = {writer.extension: writer for writer in (SrtWriter, VttWriter, JsonWriter)}
+
+
+class SubtitleDocument:
+    """Ordered cues of one run, shared by every output format"""
+    
+    def __init__(self):
+        self.cues = []
+        
+    def add(self, index, start, end, text):
+        cue = Cue(index, start, end, text)
+        self.cues.append(cue)
+        return cue
+    
+    def __len__(self):
+        return len(self.cues)
+    
+    def __iter__(self):
+        return iter(self.cues)
+    
+    @classmethod
+    def load(cls, path):
+        """Read an SRT, WebVTT or JSON subtitle file written by this tool or others"""
+        document = cls()
+        if path.lower().endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                for item in json.load(f):
+                    document.add(item["index"], item["start"], item["end"], item["text"])
+            return document
+            
+        with open(path, encoding="utf-8-sig") as f:
+            blocks = f.read().replace("\r\n", "\n").split("\n\n")
+        for block in blocks:
+            lines = [line for line in block.split("\n") if line.strip()]
+            timing = next((number for number, line in enumerate(lines) if "-->" in line), None)
+            if timing is None:
+                continue  # WEBVTT header, NOTE or STYLE blocks
+            start, end = lines[timing].split("-->")
+            # WebVTT cue settings may follow the end time
+            end = end.split()[0]
+            index = lines[timing - 1].strip() if timing else ""
+            document.add(int(index) if index.isdigit() else len(document) + 1,
+                         parse_timestamp(start), parse_timestamp(end), "\n".join(lines[timing + 1:]))
+        return document
+    
+    def save(self, path, subtitle_format=None):
+        """Write all cues in one buffered pass; the format defaults to the file extension"""
+        subtitle_format = subtitle_format or os.path.splitext(path)[1].lstrip(".").lower()
+        writer = SUBTITLE_WRITERS[subtitle_format](path, flush_every=0)
+        try:
+            for cue in self.cues:
+                writer.write(cue)
+        finally:
+            writer.close()
+
+
+def parse_timestamp(value):
+    """Milliseconds from HH:MM:SS,mmm / HH:MM:SS.mmm (hours optional, as in WebVTT)"""
+    parts = value.strip().replace(",", ".").split(":")
+    seconds = float(parts[-1]) + 60 * int(parts[-2]) + (3600 * int(parts[-3]) if len(parts) > 2 else 0)
+    return int(round(seconds * 1000))
+
+
+def output_paths(output_file, formats):
+    """Map each subtitle format to ``output_file`` if it has that extension, otherwise to the same name with it"""
+    stem, extension = os.path.splitext(output_file)
+    return {subtitle_format: output_file if extension.lstrip(".").lower() == subtitle_format
+            else f"{stem}.{subtitle_format}"
+            for subtitle_format in formats}
+
+
+def default_formats(output_file=None):
+    """Formats to write when none are asked for: the one ``output_file``'s extension names, otherwise SRT"""
+    extension = os.path.splitext(output_file or "")[1].lstrip(".").lower()
+    return (extension,) if extension in SUBTITLE_FORMATS else ("srt",)
+
+
+class PipelineMetrics:
+    """Thread-safe per-stage timings, throughput, ETA and error counts for one run"""
+    
+    STAGES = ("convert", "load", "slice", "vad", "export", "recognize", "translate", "write")
+    
+    def __init__(self, segment_length, total_segments=None):
+        self.segment_length = segment_length
+        self.total_segments = total_segments
+        self.total_audio_seconds = None  # Set when segments vary in length, for the ETA
+        self.started = time.monotonic()
+        self.stage_seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.stage_counts = dict.fromkeys(self.STAGES, 0)
+        self.counters = Counter()  # cache_hits, cache_misses, skipped, no_speech, resumed, payload_bytes
+        self.errors = Counter()    # exception type name -> count
+        self.segments_done = 0
+        self.audio_seconds = 0.0
+        self.recent = deque(maxlen=METRICS_WINDOW)  # (completion time, audio seconds) of recent segments
+        self.last_emitted = 0.0
+        self.lock = threading.Lock()
+        
+    def add(self, stage, seconds, count=1):
+        with self.lock:
+            self.stage_seconds[stage] += seconds
+            self.stage_counts[stage] += count
+            
+    @contextmanager
+    def timed(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+            
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+            
+    def error(self, exception):
+        with self.lock:
+            self.errors[type(exception).__name__] += 1
+            
+    def segment_done(self, audio_seconds=None):
+        """Count a finished segment of ``audio_seconds`` (default ``segment_length``)"""
+        if audio_seconds is None:
+            audio_seconds = self.segment_length
+        with self.lock:
+            self.segments_done += 1
+            self.audio_seconds += audio_seconds
+            self.recent.append((time.monotonic(), audio_seconds))
+            
+    def due(self):
+        """True if a periodic "metrics" event should be sent now"""
+        now = time.monotonic()
+        if now - self.last_emitted < METRICS_INTERVAL:
+            return False
+        self.last_emitted = now
+        return True
+    
+    def snapshot(self):
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            # Rolling throughput over the recent window, in audio-seconds per second
+            throughput = None
+            if len(self.recent) >= 2 and self.recent[-1][0] > self.recent[0][0]:
+                window_audio = sum(audio_seconds for _, audio_seconds in list(self.recent)[1:])
+                throughput = window_audio / (self.recent[-1][0] - self.recent[0][0])
+            elif self.segments_done and elapsed > 0:
+                throughput = self.audio_seconds / elapsed
+            eta = None
+            if self.total_audio_seconds is not None and throughput:
+                eta = max(0.0, self.total_audio_seconds - self.audio_seconds) / throughput
+            elif self.total_segments is not None and throughput:
+                remaining = max(0, self.total_segments - self.segments_done)
+                eta = remaining * self.segment_length / throughput
+            return {
+                "elapsed_seconds": elapsed,
+                "segments_done": self.segments_done,
+                "audio_seconds": self.audio_seconds,
+                "total_segments": self.total_segments,
+                "throughput": throughput,
+                "eta_seconds": eta,
+                "stages": {stage: {"seconds": self.stage_seconds[stage],
+                                   "count": self.stage_counts[stage],
+                                   "mean_ms": 1000 * self.stage_seconds[stage] / self.stage_counts[stage]
+                                   if self.stage_counts[stage] else 0.0}
+                           for stage in self.STAGES},
+                "counters": dict(self.counters),
+                "errors": dict(self.errors),
+            }
+            
+    def summary_table(self):
+        """Human-readable summary of a snapshot for the command line"""
+        snapshot = self.snapshot()
+        lines = [f"{'Stage':<10} {'Total (s)':>10} {'Count':>7} {'Mean (ms)':>10}"]
+        for stage, values in snapshot["stages"].items():
+            lines.append(f"{stage:<10} {values['seconds']:>10.2f} {values['count']:>7} {values['mean_ms']:>10.1f}")
+        throughput = snapshot["throughput"]
+        lines.append(f"Elapsed {snapshot['elapsed_seconds']:.1f}s, {snapshot['segments_done']} segments, "
+                     f"throughput {throughput or 0:.1f} audio-s/s")
+        if snapshot["counters"]:
+            lines.append("Counters: " + ", ".join(f"{name}={value}" for name, value in sorted(snapshot["counters"].items())))
+        if snapshot["errors"]:
+            lines.append("Errors: " + ", ".join(f"{name}={value}" for name, value in sorted(snapshot["errors"].items())))
+        return "\n".join(lines)
+    
+    def write_report(self, path):
+        """Write the final snapshot as JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+def cache_directory():
+    """Per-user directory for the recognition cache and the latency history"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "submaker")
+    
+
+class RecognitionCache:
+    """Persistent, thread-safe LRU cache of recognition results keyed by a hash of the segment audio"""
+    
+    def __init__(self, path=None, max_entries=DEFAULT_CACHE_ENTRIES):
+        if path is None:
+            path = os.path.join(cache_directory(), "recognition.sqlite")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        # Batch mode shares the database between processes, so wait on locks
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results "
+                                "(key TEXT PRIMARY KEY, text TEXT, last_used REAL NOT NULL)")
+        self.size = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        
+    @staticmethod
+    def make_key(pcm, sample_rate, language):
+        """Content address for one segment's recognition request"""
+        digest = hashlib.sha256(pcm)
+        digest.update(f"|{sample_rate}|{language}".encode("utf-8"))
+        return digest.hexdigest()
+    
+    def get(self, key):
+        """Return (found, text); text is None for a cached "no speech" result"""
+        with self.lock:
+            # A busy or broken cache must never fail a segment; treat it as a miss
+            try:
+                row = self.connection.execute("SELECT text FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error:
+                row = None
+            if row is None:
+                return False, None
+            return True, row[0]
+            
+    def put(self, key, text):
+        """Store a transcript (or None for no speech) and evict if over the cap"""
+        with self.lock:
+            try:
+                inserted = self.connection.execute("INSERT OR IGNORE INTO results (key, text, last_used) "
+                                                   "VALUES (?, ?, ?)", (key, text, time.time())).rowcount
+                if not inserted:
+                    self.connection.execute("UPDATE results SET text = ?, last_used = ? WHERE key = ?",
+                                            (text, time.time(), key))
+                self.size += inserted
+                if self.size > self.max_entries:
+                    # Evict a little extra so this does not run on every insert
+                    excess = self.size - self.max_entries + max(1, self.max_entries // 20)
+                    self.connection.execute("DELETE FROM results WHERE key IN "
+                                            "(SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,))
+                    self.size = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            except sqlite3.Error:
+                pass
+                
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class LatencyHistory:
+    """Moving averages of recognition latency and decode speed per backend, kept as JSON for plan()"""
+    
+    # Every SubtitleMaker has its own history, so threads of one process
+    # (e.g. job server workers) serialize their updates here
+    lock = threading.Lock()
+    
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_directory(), "latency.json")
+        
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def get(self, backend):
+        """Recorded stats for ``backend``, or None before its first run"""
+        return self.load().get(backend)
+    
+    def record(self, backend, metrics, audio_seconds):
+        """Fold the recognition and WAV preparation timings of a finished run in"""
+        calls = metrics.stage_counts["recognize"]
+        if not calls:
+            return
+        run = {"request_seconds": metrics.stage_seconds["recognize"] / calls}
+        prepare_seconds = metrics.stage_seconds["convert"] + metrics.stage_seconds["load"]
+        if prepare_seconds and audio_seconds:
+            run["prepare_rate"] = prepare_seconds / audio_seconds
+        with self.lock:
+            data = self.load()
+            entry = data.get(backend) or {}
+            for name, value in run.items():
+                previous = entry.get(name)
+                entry[name] = value if previous is None else previous + HISTORY_WEIGHT * (value - previous)
+            entry["runs"] = entry.get("runs", 0) + 1
+            entry["updated"] = time.time()
+            data[backend] = entry
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix="latency-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            
+            
+class RecognizerBackend:
+    """A speech recognition engine; class attributes tell the pipeline how to size itself for it"""
+    
+    name = None
+    description = ""
+    remote = False
+    max_concurrency = None
+    sample_rate = RECOGNIZER_SAMPLE_RATE
+    batch_size = 1
+    model_path = None  # Model directory, for engines that need one
+    
+    @property
+    def default_workers(self):
+        return DEFAULT_WORKERS
+    
+    def unavailable(self):
+        """Why the engine cannot run here, or None if it can"""
+        return None
+    
+    def recognize(self, recognizer, audio, language):
+        """Return the transcription of ``audio``; raise sr.UnknownValueError if there is no speech"""
+        raise NotImplementedError
+    
+    def recognize_batch(self, recognizer, audios, language):
+        """Return a transcription, or the sr.UnknownValueError raised, for each of ``audios``"""
+        results = []
+        for audio in audios:
+            try:
+                results.append(self.recognize(recognizer, audio, language))
+            except sr.UnknownValueError as e:
+                results.append(e)
+        return results
+        
+
+class GoogleBackend(RecognizerBackend):
+    name = "google"
+    description = "Google Web Speech API (network, rate limited)"
+    remote = True
+    
+    def recognize(self, recognizer, audio, language):
+        return recognizer.recognize_google(audio, language=language)
+    
+    
+class LocalBackend(RecognizerBackend):
+    """Offline engines: CPU bound, so one worker per core by default"""
+    
+    @property
+    def default_workers(self):
+        return os.cpu_count() or 1
+    
+    @property
+    def max_concurrency(self):
+        return os.cpu_count() or 1
+    
+    
+class SphinxBackend(LocalBackend):
+    name = "sphinx"
+    description = "CMU PocketSphinx through speech_recognition (offline)"
+    
+    def unavailable(self):
+        if importlib.util.find_spec("pocketsphinx") is None:
+            return "the pocketsphinx package is not installed"
+        return None
+    
+    def recognize(self, recognizer, audio, language):
+        return recognizer.recognize_sphinx(audio, language=language)
+    
+    
+class VoskBackend(LocalBackend):
+    name = "vosk"
+    description = "Vosk/Kaldi with a local model directory (offline)"
+    
+    def __init__(self):
+        self.model = None
+        self.model_lock = threading.Lock()
+        
+    def unavailable(self):
+        if importlib.util.find_spec("vosk") is None:
+            return "the vosk package is not installed"
+        if not self.model_path or not os.path.isdir(self.model_path):
+            return "a model directory is needed (--model PATH, see https://alphacephei.com/vosk/models)"
+        return None
+    
+    def load_model(self):
+        """Load the model once; it is shared by every worker"""
+        with self.model_lock:
+            if self.model is None:
+                import vosk
+                vosk.SetLogLevel(-1)
+                self.model = vosk.Model(self.model_path)
+            return self.model
+    
+    def recognize(self, recognizer, audio, language):
+        # The model decides the language; ``language`` is only part of the cache key
+        import vosk
+        engine = vosk.KaldiRecognizer(self.load_model(), audio.sample_rate)
+        engine.AcceptWaveform(audio.get_raw_data(convert_width=SAMPLE_WIDTH))
+        text = json.loads(engine.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+    
+    
+class FakeBackend(RecognizerBackend):
+    """Deterministic offline stand-in for tests: the language and a hash of the audio, or no speech if quiet"""
+    
+    name = "fake"
+    description = "deterministic stand-in for tests (offline)"
+    sample_rate = None
+    batch_size = 8
+    
+    def recognize(self, recognizer, audio, language):
+        samples = np.frombuffer(audio.frame_data, dtype=np.int16)
+        if not samples.size or np.abs(samples.astype(np.int32)).max() < 32768 * 10 ** (VAD_THRESHOLD_DB / 20):
+            raise sr.UnknownValueError()
+        return f"{language} {hashlib.sha1(audio.frame_data).hexdigest()[:8]}"
+    
+    
+RECOGNIZER_BACKENDS = {backend.name: backend for backend in (GoogleBackend, SphinxBackend, VoskBackend, FakeBackend)}
+
+
+class RequestGovernor:
+    """Rate limiting, retries with backoff and adaptive concurrency for one remote service"""
+    
+    def __init__(self, rate=None, burst=1, max_concurrency=DEFAULT_WORKERS, max_retries=GOVERNOR_MAX_RETRIES,
+                 backoff_base=GOVERNOR_BACKOFF_BASE, backoff_max=GOVERNOR_BACKOFF_MAX,
+                 max_waiting_retries=GOVERNOR_RETRY_QUEUE, retryable=(Exception,)):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_waiting_retries = max_waiting_retries
+        self.retryable = retryable
+        self.limit = float(max_concurrency)
+        self.active = 0
+        self.tokens = float(burst)
+        self.refilled = time.monotonic()
+        self.last_decrease = 0.0
+        self.waiting_retries = 0
+        self.random = random.Random()
+        self.condition = threading.Condition()
+        
+    def set_max_concurrency(self, max_concurrency):
+        """Cap concurrent calls, e.g. at the number of pipeline workers"""
+        with self.condition:
+            self.max_concurrency = max(1, max_concurrency)
+            if self.last_decrease:
+                self.limit = min(self.limit, self.max_concurrency)
+            else:
+                self.limit = float(self.max_concurrency)  # never throttled: start at full speed
+            self.condition.notify_all()
+            
+    def acquire(self):
+        """Wait for a concurrency slot and, if rate limited, a token"""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self.rate:
+                    self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+                self.refilled = now
+                if self.active >= int(self.limit):
+                    self.condition.wait()
+                elif self.rate and self.tokens < 1:
+                    self.condition.wait((1 - self.tokens) / self.rate)
+                else:
+                    if self.rate:
+                        self.tokens -= 1
+                    self.active += 1
+                    return
+                    
+    def release(self, throttled):
+        """Free a slot; shrink the concurrency limit after a retryable error, else grow it"""
+        with self.condition:
+            self.active -= 1
+            now = time.monotonic()
+            if throttled:
+                if now - self.last_decrease >= self.backoff_base:
+                    self.limit = max(1.0, self.limit / 2)
+                    self.last_decrease = now
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self.condition.notify_all()
+            
+    def backoff(self, attempt):
+        """Seconds to wait before retry number ``attempt`` (full jitter)"""
+        return self.random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+    
+    def call(self, func, *args, metrics=None, **kwargs):
+        """Call ``func(*args, **kwargs)`` under the limits, retrying as configured and counting in ``metrics``"""
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except self.retryable:
+                self.release(throttled=True)
+                with self.condition:
+                    retry = attempt < self.max_retries and self.waiting_retries < self.max_waiting_retries
+                    if retry:
+                        self.waiting_retries += 1
+                if not retry:
+                    if metrics is not None:
+                        metrics.count("gave_up")
+                    raise
+                if metrics is not None:
+                    metrics.count("retries")
+                attempt += 1
+                try:
+                    time.sleep(self.backoff(attempt))
+                finally:
+                    with self.condition:
+                        self.waiting_retries -= 1
+            except BaseException:
+                # The service answered (e.g. "no speech"); not a sign of overload
+                self.release(throttled=False)
+                raise
+            else:
+                self.release(throttled=False)
+                return result
+        
+
+class TranslationStage:
+    """Batched, memoized translation on its own thread; ``submit`` returns a Future"""
+    
+    def __init__(self, translator, batch_size=TRANSLATION_BATCH_SIZE,
+                 batch_wait=TRANSLATION_BATCH_WAIT, memo_entries=TRANSLATION_MEMO_ENTRIES, governor=None):
+        self.translator = translator
+        self.governor = governor  # RequestGovernor for translator calls, if any
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.memo_entries = memo_entries
+        self.memo = OrderedDict()  # (text, dest) -> translated text
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.thread = None
+        
+    def lookup(self, text, dest):
+        """Return the memoized translation or None"""
+        with self.lock:
+            translated = self.memo.get((text, dest))
+            if translated is not None:
+                self.memo.move_to_end((text, dest))
+            return translated
+            
+    def remember(self, text, dest, translated):
+        with self.lock:
+            self.memo[(text, dest)] = translated
+            self.memo.move_to_end((text, dest))
+            while len(self.memo) > self.memo_entries:
+                self.memo.popitem(last=False)
+                
+    def submit(self, text, dest, metrics=None):
+        """Queue ``text`` for translation into ``dest``; returns a Future"""
+        future = Future()
+        translated = self.lookup(text, dest)
+        if translated is not None:
+            if metrics is not None:
+                metrics.count("translation_reused")
+            future.set_result(translated)
+            return future
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.requests.put((text, dest, future, metrics))
+        return future
+    
+    def run(self):
+        """Collect requests into batches until close() is called"""
+        stopping = False
+        while not stopping:
+            request = self.requests.get()
+            if request is None:
+                break
+            batch = [request]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    request = self.requests.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            try:
+                self.translate_batch(batch)
+            except Exception as e:
+                # Fail whatever the batch left unresolved; the stage keeps serving
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            
+    def translate_batch(self, batch):
+        """Translate each distinct (text, dest) in ``batch`` once and resolve its futures"""
+        by_dest = {}
+        for text, dest, future, metrics in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            by_dest.setdefault(dest, {}).setdefault(text, []).append((future, metrics))
+        for dest, requests_by_text in by_dest.items():
+            pending = []
+            for text, requests in requests_by_text.items():
+                translated = self.lookup(text, dest)
+                if translated is None:
+                    pending.append(text)
+                else:
+                    self.resolve(requests, translated, reused=len(requests))
+            if not pending:
+                continue
+            # Every job with strings in this batch waited for the whole call
+            job_metrics = {}
+            for text in pending:
+                first_metrics = requests_by_text[text][0][1]
+                if first_metrics is not None:
+                    job_metrics[id(first_metrics)] = first_metrics
+                    first_metrics.count("translated")
+            started = time.perf_counter()
+            try:
+                if self.governor is not None:
+                    results = self.governor.call(self.translator.translate, pending, dest=dest)
+                else:
+                    results = self.translator.translate(pending, dest=dest)
+                translations = [result.text for result in results]
+                if len(translations) != len(pending):
+                    raise ValueError(f"translator returned {len(translations)} results for {len(pending)} strings")
+            except Exception as e:
+                for text in pending:
+                    for future, _ in requests_by_text[text]:
+                        future.set_exception(e)
+                continue
+            finally:
+                elapsed = time.perf_counter() - started
+                for metrics in job_metrics.values():
+                    metrics.add("translate", elapsed)
+                    metrics.count("translation_batches")
+            for text, translated in zip(pending, translations):
+                self.remember(text, dest, translated)
+                self.resolve(requests_by_text[text], translated, reused=len(requests_by_text[text]) - 1)
+                
+    def resolve(self, requests, translated, reused):
+        """Resolve every (future, metrics) request with ``translated``; the last ``reused`` count as reuses"""
+        for position, (future, metrics) in enumerate(requests):
+            if metrics is not None and position >= len(requests) - reused:
+                metrics.count("translation_reused")
+            future.set_result(translated)
+            
+    def close(self):
+        """Finish outstanding batches and stop the worker thread (memo is kept)"""
+        if self.thread is not None and self.thread.is_alive():
+            self.requests.put(None)
+            self.thread.join()
+        self.thread = None
+
+
+class SegmentJournal:
+    """Append-only JSON-lines checkpoint of finished segments after a header line of settings"""
+    
+    VERSION = 1
+    
+    def __init__(self, path, header):
+        self.path = path
+        self.header = dict(header, journal=self.VERSION)
+        self.file = None
+        
+    @staticmethod
+    def fingerprint(input_file, sample_size=1 << 20):
+        """Identify the input by size plus a hash of its first and last megabyte"""
+        size = os.path.getsize(input_file)
+        digest = hashlib.sha256(str(size).encode("ascii"))
+        with open(input_file, "rb") as f:
+            digest.update(f.read(sample_size))
+            if size > sample_size:
+                f.seek(max(sample_size, size - sample_size))
+                digest.update(f.read(sample_size))
+        return digest.hexdigest()
+    
+    def load(self):
+        """Return {seq: (start_time, end_time, text, retry)} from a journal matching this header, else None"""
+        if not os.path.exists(self.path):
+            return None
+        entries = {}
+        valid_size = 0
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f):
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if number == 0:
+                    if record != self.header:
+                        return None
+                else:
+                    entries[record["seq"]] = (record["start"], record["end"], record["text"], record.get("retry"))
+                valid_size += len(line)
+        if valid_size == 0:
+            return None
+        # Drop a torn tail so new records start on a fresh line
+        if valid_size != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_size)
+        return entries
+    
+    def start(self, resume=False):
+        """Open for appending; unless resuming, replace any old journal"""
+        if resume:
+            self.file = open(self.path, "a", encoding="utf-8")
+        else:
+            self.file = open(self.path, "w", encoding="utf-8")
+            self.write(self.header)
+            
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        
+    def record(self, seq, start_time, end_time, text, retry=None):
+        """Checkpoint one finished segment (text is None when there was no speech)"""
+        record = {"seq": seq, "start": start_time, "end": end_time, "text": text}
+        if retry:
+            record["retry"] = retry
+        self.write(record)
+        
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SubtitleJob:
+    """Paths, working files, progress, cancel flag, metrics and handles of one run, so runs can share a maker"""
+    
+    def __init__(self, input_file=None, output_file=None, recognizer=None, translator=None):
+        self.input_file = os.path.abspath(input_file) if input_file else None
+        self.output_file = os.path.abspath(output_file) if output_file else None
+        self.recognizer = recognizer
+        self.translator = translator  # None means the maker's translator
+        self.translation_stage = None  # Private TranslationStage, if the job needs one
+        self.temp_dir = None
+        self.progress = 0
+        self.audio_duration = None  # Seconds of audio processed
+        self.metrics = None  # PipelineMetrics of this run
+        self.documents = {}  # target language -> SubtitleDocument
+        self.document = None  # SubtitleDocument of the first target
+        self.cancel_flag = False
+        
+    def cancel(self):
+        self.cancel_flag = True
+        
+    def temp_file(self, suffix):
+        """Create an empty file in this job's temporary directory and return its path"""
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.mkdtemp(prefix="submaker-")
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=self.temp_dir)
+        os.close(fd)
+        return path
+    
+    def cleanup(self):
+        """Remove the temporary directory and stop a private translation stage"""
+        if self.temp_dir is not None:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+        if self.translation_stage is not None:
+            self.translation_stage.close()
+            self.translation_stage = None
+
+
 class SubtitleMaker:
+    # Set once ffmpeg has been found; later jobs in this process skip the check
+    ffmpeg_available = False
+    
     def __init__(self):
-        self.translator = Translator()
+        self.translator_instance = None  # Created on first use, see ``translator``
         self.recognizer = sr.Recognizer()
+        self.backend = GoogleBackend()  # Engine segments are sent to, see use_backend
         self.audio_file = None
         self.target_lang = None
         self.segment_length = 10  # Default segment length in seconds
+        self.workers = None  # Segments recognized concurrently; None means the backend's default
+        self.decode_mode = "wav"  # One of DECODE_MODES
+        self.decoders = None  # ffmpeg processes in seek mode; None means one per CPU
+        self.audio_profile = AudioProfile()  # Format of the audio sent to the recognizer
+        self.vad_enabled = False  # Skip segments without speech before recognition
+        self.vad_threshold_db = VAD_THRESHOLD_DB
+        self.vad_min_speech_ratio = VAD_MIN_SPEECH_RATIO
+        self.segmentation = "fixed"  # One of SEGMENTATION_MODES; "pause" needs the WAV decode mode
+        self.pause_min_ms = PAUSE_MIN_MS
+        self.pause_max_gap = PAUSE_MAX_GAP
+        self.cache_enabled = True  # Reuse recognition results across runs
+        self.cache_path = None  # None means the per-user cache directory
+        self.cache_max_entries = DEFAULT_CACHE_ENTRIES
+        self.cache = None
+        self.history_enabled = True  # Record recognition latency for plan()
+        self.history_path = None  # None means latency.json in the per-user cache directory
+        self.history = None
+        # Rate limits, retries and adaptive concurrency for the remote services;
+        # "no speech" answers are final, any other recognizer request error is retried
+        self.recognize_governor = RequestGovernor(retryable=(sr.RequestError,))
+        self.translate_governor = RequestGovernor(max_concurrency=1)
+        self.translation_stage = None
         self.output_dir = None
         self.processing = False
-        self.progress = 0
-        self.cancel_flag = False
+        self.metrics_file = None  # Optional path for a JSON metrics report
+        self.output_formats = ("srt",)  # Any of SUBTITLE_FORMATS, written together
+        self.flush_every = SUBTITLE_FLUSH_EVERY  # Cues buffered between writes
+        self.job = None  # SubtitleJob of the current or last run
+        self.active_jobs = set()  # Jobs running now, cancelled by cancel_processing
+        self.jobs_lock = threading.Lock()
+        
+    @property
+    def translator(self):
+        """googletrans Translator, created when first needed so runs without translation never import it"""
+        if self.translator_instance is None:
+            self.translator_instance = Translator()
+        return self.translator_instance
+    
+    @translator.setter
+    def translator(self, translator):
+        self.translator_instance = translator
+        
+    # Results of the current or last job, for callers running one job at a time
+    @property
+    def progress(self):
+        return self.job.progress if self.job else 0
+    
+    @property
+    def audio_duration(self):
+        return self.job.audio_duration if self.job else None
+    
+    @property
+    def metrics(self):
+        return self.job.metrics if self.job else None
+    
+    @property
+    def document(self):
+        return self.job.document if self.job else None
+    
+    @property
+    def documents(self):
+        return self.job.documents if self.job else {}
+    
+    def warm_up(self, translate=True):
+        """Import the audio dependencies and create the translator now instead of in the first job"""
+        for dependency in (np, AudioSegment):
+            if isinstance(dependency, LazyImport):
+                dependency.load()
+        if translate:
+            self.translator
+            
+    def new_job(self, input_file=None, output_file=None):
+        """A SubtitleJob using this maker's recognizer and translator"""
+        # No translator handle: the maker's is only created if the job translates
+        return SubtitleJob(input_file, output_file, self.recognizer)
+    
+    @contextmanager
+    def running(self, job):
+        """Register ``job`` as active for the duration of a run and clean it up afterwards"""
+        with self.jobs_lock:
+            self.job = job
+            self.active_jobs.add(job)
+        try:
+            yield job
+        finally:
+            with self.jobs_lock:
+                self.active_jobs.discard(job)
+            job.cleanup()
         
     def format_time(self, milliseconds):
         """Convert milliseconds to SRT time format (HH:MM:SS,mmm)"""
-        t = timedelta(milliseconds=milliseconds)
-        hours, remainder = divmod(t.seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds % 1000:03d}"
+        return format_timestamp(milliseconds)
     
     def check_ffmpeg(self):
-        """Check if ffmpeg is installed and in PATH"""
+        """Check if ffmpeg is installed and in PATH (a successful check is remembered process-wide)"""
+        if SubtitleMaker.ffmpeg_available:
+            return True
         try:
             subprocess.run(['ffmpeg', '-version'], 
                           stdout=subprocess.PIPE, 
                           stderr=subprocess.PIPE, 
                           check=True)
+            SubtitleMaker.ffmpeg_available = True
             return True
         except (subprocess.SubprocessError, FileNotFoundError):
             return False
     
     def convert_to_wav(self, input_file, output_file="transcript.wav"):
-        """Convert input audio file to WAV format using ffmpeg"""
+        """Convert input audio file to a WAV in the recognizer audio profile using ffmpeg"""
         try:
-            subprocess.run(['ffmpeg', '-i', input_file, '-y', output_file], 
+            subprocess.run(['ffmpeg', '-i', input_file, '-y', '-vn', '-acodec', 'pcm_s16le']
+                           + self.audio_profile.ffmpeg_args() + [output_file], 
                           stdout=subprocess.PIPE, 
                           stderr=subprocess.PIPE,
                           check=True)
@@ -99,164 +1252,1197 @@ class SubtitleMaker:
             print(f"Error converting file: {e}")
             return False
     
-    def process_audio(self, input_file, target_lang, segment_length, output_file=None, callback=None):
+    def probe(self, input_file):
+        """Duration, format, codec, sample_rate, channels and bit_rate of the first audio stream, or None"""
+        try:
+            result = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'a:0', '-show_entries',
+                                     'format=duration,bit_rate,format_name:stream=codec_name,sample_rate,channels',
+                                     '-of', 'json', input_file],
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    check=True)
+            info = json.loads(result.stdout)
+        except FileNotFoundError:
+            return self.probe_header(input_file)
+        except (subprocess.SubprocessError, ValueError):
+            return None
+        if not info.get("streams"):
+            return None
+        container = info.get("format", {})
+        stream = info["streams"][0]
+        
+        def number(value, kind):
+            try:
+                return kind(value)
+            except (TypeError, ValueError):
+                return None
+            
+        return {
+            "duration": number(container.get("duration"), float),
+            "format": container.get("format_name"),
+            "codec": stream.get("codec_name"),
+            "sample_rate": number(stream.get("sample_rate"), int),
+            "channels": number(stream.get("channels"), int),
+            "bit_rate": number(container.get("bit_rate"), int),
+        }
+    
+    def probe_header(self, input_file):
+        """probe() from the input summary ffmpeg prints when given no output"""
+        try:
+            result = subprocess.run(['ffmpeg', '-nostdin', '-hide_banner', '-i', input_file],
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+        except (subprocess.SubprocessError, FileNotFoundError):
+            return None
+        header = result.stderr.decode(errors="replace")
+        stream = re.search(r"Stream #0:\d+.*?: Audio: (\w+)[^,]*, (\d+) Hz, ([^,]+)", header)
+        if stream is None:
+            return None
+        duration = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", header)
+        bit_rate = re.search(r"Duration: .*bitrate: (\d+) kb/s", header)
+        container = re.search(r"Input #0, ([^ ]+), from", header)
+        layout = stream.group(3).strip()
+        channels = re.match(r"(\d+) channels", layout)
+        return {
+            "duration": (int(duration.group(1)) * 3600 + int(duration.group(2)) * 60 + float(duration.group(3))
+                         if duration else None),
+            "format": container.group(1) if container else None,
+            "codec": stream.group(1),
+            "sample_rate": int(stream.group(2)),
+            "channels": int(channels.group(1)) if channels else {"mono": 1, "stereo": 2}.get(layout),
+            "bit_rate": int(bit_rate.group(1)) * 1000 if bit_rate else None,
+        }
+    
+    def iter_stream_segments(self, input_file, segment_length, sample_rate=RECOGNIZER_SAMPLE_RATE):
+        """Yield (seq, start_time, end_time, samples) one segment at a time from an ffmpeg PCM pipe"""
+        process = subprocess.Popen(['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', input_file,
+                                    '-vn', '-f', 's16le', '-acodec', 'pcm_s16le']
+                                   + self.audio_profile.ffmpeg_args(sample_rate) + ['-'],
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE)
+        segment_ms = segment_length * 1000
+        chunk_size = segment_length * sample_rate * SAMPLE_WIDTH
+        try:
+            seq = 0
+            while True:
+                chunk = bytearray()
+                while len(chunk) < chunk_size:
+                    data = process.stdout.read(chunk_size - len(chunk))
+                    if not data:
+                        break
+                    chunk += data
+                # Like the WAV path, a trailing partial segment is dropped
+                if len(chunk) < chunk_size:
+                    break
+                seq += 1
+                yield seq, (seq - 1) * segment_ms, seq * segment_ms, np.frombuffer(bytes(chunk), dtype=np.int16)
+            if process.wait() != 0:
+                raise DecodeError(process.stderr.read().decode(errors="replace").strip())
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+    
+    def decode_range(self, input_file, start, length, sample_rate=RECOGNIZER_SAMPLE_RATE):
+        """Decode ``length`` seconds from ``start`` of the first audio stream to mono PCM samples"""
+        result = subprocess.run(['ffmpeg', '-nostdin', '-loglevel', 'error',
+                                 '-ss', f"{start:.3f}", '-t', f"{length:.3f}", '-i', input_file,
+                                 '-map', '0:a:0', '-f', 's16le', '-acodec', 'pcm_s16le']
+                                + self.audio_profile.ffmpeg_args(sample_rate) + ['-'],
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise DecodeError(result.stderr.decode(errors="replace").strip())
+        return np.frombuffer(result.stdout, dtype=np.int16)
+    
+    def iter_seek_segments(self, input_file, segment_length, duration, sample_rate=RECOGNIZER_SAMPLE_RATE):
+        """Yield (seq, start_time, end_time, samples) in order, decoding segments in parallel by seeking"""
+        total_segments = int(duration // segment_length)
+        decoders = max(1, self.decoders or os.cpu_count() or 1)
+        segment_ms = segment_length * 1000
+        executor = ThreadPoolExecutor(max_workers=decoders)
+        pending = deque()
+        try:
+            next_seq = 1
+            for seq in range(1, total_segments + 1):
+                while next_seq <= total_segments and len(pending) < decoders * 2:
+                    pending.append(executor.submit(self.decode_range, input_file,
+                                                   (next_seq - 1) * segment_length, segment_length, sample_rate))
+                    next_seq += 1
+                yield seq, (seq - 1) * segment_ms, seq * segment_ms, pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def iter_segments(self, samples, sample_rate, segment_length):
+        """Yield (seq, start_time, end_time, samples) on the fixed segment grid"""
+        segment_ms = segment_length * 1000
+        for seq in range(1, len(samples) * 1000 // sample_rate // segment_ms + 1):
+            start_time = (seq - 1) * segment_ms
+            end_time = seq * segment_ms
+            yield (seq, start_time, end_time,
+                   samples[start_time * sample_rate // 1000:end_time * sample_rate // 1000])
+    
+    def plan_pause_segments(self, samples, sample_rate, segment_length):
+        """Return [(start_time, end_time)] in ms for requests of about ``segment_length`` cut at pauses"""
+        frame_size = max(1, sample_rate * VAD_FRAME_MS // 1000)
+        frame_count = len(samples) // frame_size
+        if frame_count == 0:
+            return []
+        frames = samples[:frame_count * frame_size].reshape(frame_count, frame_size).astype(np.float32)
+        power = np.einsum('ij,ij->i', frames, frames) / frame_size
+        voiced = power > (32768.0 * 10 ** (self.vad_threshold_db / 20)) ** 2
+        speech = np.flatnonzero(voiced)
+        if len(speech) == 0:
+            return []
+            
+        # Runs of silent frames: [starts, ends) from the edges of the mask
+        edges = np.diff(np.concatenate(([0], (~voiced).astype(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        keep = run_ends - run_starts >= max(1, self.pause_min_ms // VAD_FRAME_MS)
+        pause_starts = run_starts[keep]
+        pause_ends = run_ends[keep]
+        pause_lengths = pause_ends - pause_starts
+        gap_frames = int(self.pause_max_gap * 1000 // VAD_FRAME_MS)
+        padding = PAUSE_PADDING_MS // VAD_FRAME_MS
+        target_frames = max(1, int(segment_length * 1000 // VAD_FRAME_MS) - 2 * padding)
+        max_frames = max(target_frames + 1, int(target_frames * PAUSE_MAX_STRETCH))
+        
+        spans = []
+        position = speech[0]
+        last = speech[-1] + 1
+        while position < last:
+            target = position + target_frames
+            limit = position + max_frames
+            # Pauses starting inside (position, limit]
+            first = np.searchsorted(pause_starts, position, side="right")
+            stop = np.searchsorted(pause_starts, min(limit, last), side="right")
+            long_gaps = np.flatnonzero(pause_lengths[first:stop] >= gap_frames)
+            if long_gaps.size:
+                pause = first + long_gaps[0]
+            elif limit >= last:
+                spans.append((position, last))
+                break
+            elif stop > first:
+                after_target = np.searchsorted(pause_starts, target)
+                pause = after_target if after_target < stop else stop - 1
+            else:
+                cut = target + int(np.argmin(power[target:limit]))
+                spans.append((position, cut))
+                position = cut
+                continue
+            spans.append((position, pause_starts[pause]))
+            position = pause_ends[pause]
+            if position >= last:
+                break
+            
+        # Pad each request with up to PAUSE_PADDING_MS of silence, never more
+        # than half the gap to its neighbour
+        length_ms = len(samples) * 1000 // sample_rate
+        segments = []
+        for index, (start, end) in enumerate(spans):
+            before = padding if index == 0 else min(padding, (start - spans[index - 1][1]) // 2)
+            after = padding if index == len(spans) - 1 else min(padding, (spans[index + 1][0] - end) // 2)
+            segments.append((max(0, int(start - before) * VAD_FRAME_MS),
+                             min(length_ms, int(end + after) * VAD_FRAME_MS)))
+        return segments
+    
+    def iter_planned_segments(self, samples, sample_rate, plan):
+        """Yield (seq, start_time, end_time, samples) for [(start_time, end_time)] in ms"""
+        for seq, (start_time, end_time) in enumerate(plan, 1):
+            yield (seq, start_time, end_time,
+                   samples[start_time * sample_rate // 1000:end_time * sample_rate // 1000])
+    
+    def speech_ratio(self, samples, sample_rate, threshold_db=VAD_THRESHOLD_DB, frame_ms=VAD_FRAME_MS):
+        """Fraction of frames in ``samples`` whose RMS level exceeds ``threshold_db`` dBFS"""
+        frame_size = max(1, sample_rate * frame_ms // 1000)
+        frame_count = len(samples) // frame_size
+        if frame_count == 0:
+            return 0.0
+        frames = samples[:frame_count * frame_size].reshape(frame_count, frame_size).astype(np.float32)
+        # Compare mean power against the squared threshold instead of taking roots
+        power = np.einsum('ij,ij->i', frames, frames) / frame_size
+        threshold = (32768.0 * 10 ** (threshold_db / 20)) ** 2
+        return np.count_nonzero(power > threshold) / frame_count
+    
+    def has_speech(self, samples, sample_rate):
+        """Voice activity check used to skip silent or music-only segments"""
+        return self.speech_ratio(samples, sample_rate, self.vad_threshold_db) >= self.vad_min_speech_ratio
+    
+    def load_samples(self, audio_segment):
+        """Return (samples, sample_rate): the WAV file as mono 16-bit PCM in a NumPy array"""
+        if audio_segment.channels != 1:
+            audio_segment = audio_segment.set_channels(1)
+        if audio_segment.sample_width != SAMPLE_WIDTH:
+            audio_segment = audio_segment.set_sample_width(SAMPLE_WIDTH)
+        samples = np.frombuffer(audio_segment.raw_data, dtype=np.int16)
+        return samples, audio_segment.frame_rate
+    
+    def segment_audio_data(self, samples, sample_rate, start_time, end_time):
+        """Build the recognizer payload for [start_time, end_time) ms in memory"""
+        first = start_time * sample_rate // 1000
+        last = end_time * sample_rate // 1000
+        return sr.AudioData(samples[first:last].tobytes(), sample_rate, SAMPLE_WIDTH)
+    
+    def get_cache(self):
+        """Open the recognition cache on first use, or return None if disabled"""
+        if not self.cache_enabled:
+            return None
+        if self.cache is None:
+            self.cache = RecognitionCache(self.cache_path, self.cache_max_entries)
+        return self.cache
+    
+    def use_backend(self, name, model_path=None):
+        """Send segments to the RECOGNIZER_BACKENDS engine ``name`` at its preferred sample rate"""
+        backend = RECOGNIZER_BACKENDS[name]()
+        backend.model_path = model_path
+        self.backend = backend
+        if backend.sample_rate:
+            self.audio_profile.sample_rate = backend.sample_rate
+        return backend
+    
+    def worker_count(self, workers=None):
+        """Segments to recognize at once: ``workers``, ``self.workers`` or the backend's default, within its cap"""
+        workers = workers or self.workers or self.backend.default_workers
+        if self.backend.max_concurrency:
+            workers = min(workers, self.backend.max_concurrency)
+        return max(1, int(workers))
+    
+    def recognize_segment(self, audio, language, job=None):
+        """Recognize one segment with the job's recognizer, going through the recognition cache if enabled"""
+        transcription = self.recognize_batch([audio], language, job)[0]
+        if isinstance(transcription, Exception):
+            raise transcription
+        return transcription
+    
+    def recognize_batch(self, audios, language, job=None):
+        """Recognize segments in one backend call; returns a text or sr.UnknownValueError for each"""
+        metrics = job.metrics if job is not None and job.metrics is not None else PipelineMetrics(0)
+        recognizer = job.recognizer if job is not None and job.recognizer is not None else self.recognizer
+        backend = self.backend
+        cache = self.cache if self.cache_enabled else None
+        # Each engine transcribes differently; Google keeps the keys of earlier versions
+        cache_language = language if backend.name == "google" else f"{backend.name}:{language}"
+        results = [None] * len(audios)
+        keys = {}
+        for index, audio in enumerate(audios):
+            if cache is None:
+                continue
+            keys[index] = cache.make_key(audio.frame_data, audio.sample_rate, cache_language)
+            found, transcription = cache.get(keys[index])
+            metrics.count("cache_hits" if found else "cache_misses")
+            if found:
+                results[index] = sr.UnknownValueError() if transcription is None else transcription
+        pending = [index for index in range(len(audios)) if results[index] is None]
+        if not pending:
+            return results
+            
+        batch = [audios[index] for index in pending]
+        metrics.count("payload_bytes", sum(len(audio.frame_data) for audio in batch))
+        with metrics.timed("recognize"):
+            if backend.remote:
+                transcriptions = self.recognize_governor.call(backend.recognize_batch, recognizer, batch, language,
+                                                              metrics=metrics)
+            else:
+                transcriptions = backend.recognize_batch(recognizer, batch, language)
+        for index, transcription in zip(pending, transcriptions):
+            results[index] = transcription
+            if index in keys:
+                cache.put(keys[index], None if isinstance(transcription, sr.UnknownValueError) else transcription)
+        return results
+    
+    def get_history(self):
+        """The latency history used by plan(), or None if disabled"""
+        if not self.history_enabled:
+            return None
+        if self.history is None:
+            self.history = LatencyHistory(self.history_path)
+        return self.history
+    
+    def plan(self, input_file, segment_length, workers=None):
+        """Predict the cost of processing ``input_file`` from its metadata and a few sampled segments"""
+        started = time.perf_counter()
+        info = self.probe(input_file)
+        if not info or not info["duration"]:
+            raise DecodeError(f"ffprobe could not read the duration of {input_file}")
+        duration = info["duration"]
+        segments = int(duration // segment_length)
+        workers = self.worker_count(workers)
+        
+        # Cheap energy scan: a few grid segments decoded at the recognizer rate
+        picks = sorted(set(np.linspace(0, segments - 1, min(PLAN_SAMPLE_SEGMENTS, segments)).round().astype(int)))
+        with ThreadPoolExecutor(max_workers=max(1, self.decoders or os.cpu_count() or 1)) as executor:
+            sampled = list(executor.map(lambda index: self.decode_range(input_file, index * segment_length,
+                                                                        segment_length, RECOGNIZER_SAMPLE_RATE),
+                                        picks))
+        ratios = [self.speech_ratio(samples, RECOGNIZER_SAMPLE_RATE, self.vad_threshold_db) for samples in sampled]
+        speech_share = (sum(ratio >= self.vad_min_speech_ratio for ratio in ratios) / len(ratios)) if ratios else 0.0
+        voiced_share = sum(ratios) / len(ratios) if ratios else 0.0
+        speech_segments = round(segments * speech_share)
+        
+        if self.segmentation == "pause" and self.decode_mode == "wav":
+            # Requests span the segments with speech but only carry its voiced part
+            requests = math.ceil(duration * speech_share / segment_length)
+            audio_sent = duration * voiced_share
+        elif self.vad_enabled:
+            audio_sent = speech_segments * segment_length
+            requests = speech_segments
+        else:
+            audio_sent = segments * segment_length
+            requests = segments
+        sample_rate = self.audio_profile.sample_rate or info["sample_rate"] or RECOGNIZER_SAMPLE_RATE
+        
+        # Wall time: WAV preparation, then waves of ``workers`` concurrent calls
+        history = self.get_history()
+        recorded = (history.get(self.backend.name) if history is not None else None) or {}
+        request_seconds = recorded.get("request_seconds") or PLAN_DEFAULT_LATENCY
+        calls = math.ceil(requests / max(1, self.backend.batch_size))
+        recognize_seconds = math.ceil(calls / workers) * request_seconds
+        if self.backend.remote and self.recognize_governor.rate:
+            recognize_seconds = max(recognize_seconds, calls / self.recognize_governor.rate)
+        prepare_seconds = duration * recorded.get("prepare_rate", 0.0) if self.decode_mode == "wav" else 0.0
+        
+        return {
+            "file": os.path.abspath(input_file),
+            "duration_seconds": duration,
+            "source": {name: info[name] for name in ("format", "codec", "sample_rate", "channels", "bit_rate")},
+            "segment_length": segment_length,
+            "segmentation": self.segmentation,
+            "vad": self.vad_enabled,
+            "segments": segments,
+            "sampled_segments": len(picks),
+            "speech_share": speech_share,
+            "voiced_share": voiced_share,
+            "segments_with_speech": speech_segments,
+            "requests": requests,
+            "backend": self.backend.name,
+            "backend_calls": calls,
+            "upload_bytes": int(audio_sent * sample_rate * SAMPLE_WIDTH),
+            "workers": workers,
+            "request_seconds": request_seconds,
+            "latency_source": "history" if recorded.get("request_seconds") else "default",
+            "history_runs": recorded.get("runs", 0),
+            "prepare_seconds": prepare_seconds,
+            "wall_seconds": prepare_seconds + recognize_seconds,
+            "plan_seconds": time.perf_counter() - started,
+        }
+    
+    def get_translation_stage(self, job=None):
+        """Return the translation stage for ``job``, creating it on first use"""
+        if job is not None and job.translator is not None and job.translator is not self.translator:
+            if job.translation_stage is None:
+                job.translation_stage = TranslationStage(job.translator, governor=self.translate_governor)
+            return job.translation_stage
+        with self.jobs_lock:
+            if self.translation_stage is None or self.translation_stage.translator is not self.translator:
+                self.translation_stage = TranslationStage(self.translator, governor=self.translate_governor)
+            return self.translation_stage
+    
+    def translation_dest(self, source_lang, target_lang):
+        """Translator language code for ``target_lang``, or None if ``source_lang`` already yields it"""
+        dest = target_lang.split('-')[0]
+        return None if dest == source_lang.split('-')[0] else dest
+    
+    def target_output_file(self, output_file, target_lang, targets):
+        """Output file for one target; with several targets the language goes in the name"""
+        if len(targets) == 1:
+            return output_file
+        stem, extension = os.path.splitext(output_file)
+        return f"{stem}.{target_lang}{extension}"
+    
+    def translate_subtitles(self, subtitle_file, target_langs, source_lang=None, output_file=None, callback=None,
+                            job=None):
+        """Translate an existing subtitle file into new languages without any audio processing"""
+        job = job or self.new_job(subtitle_file, output_file)
+        with self.running(job):
+            return self.translate_job(job, target_langs, source_lang, callback)
+        
+    def translate_job(self, job, target_langs, source_lang=None, callback=None):
+        """Body of translate_subtitles for one registered job"""
+        targets = [target_langs] if isinstance(target_langs, str) else list(dict.fromkeys(target_langs))
+        metrics = job.metrics = PipelineMetrics(0)
+        try:
+            with metrics.timed("load"):
+                source = SubtitleDocument.load(job.input_file)
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            if callback:
+                callback("error", f"Could not read subtitle file: {e}")
+            return False
+            
+        if callback:
+            callback("status", f"Translating {len(source)} cues into {', '.join(targets)}...")
+            callback("max_progress", len(source) * len(targets))
+            
+        # Queue every cue for every target up front; the stage batches and dedupes them
+        stage = self.get_translation_stage(job)
+        futures = {}
+        for target in targets:
+            dest = self.translation_dest(source_lang, target) if source_lang else target.split('-')[0]
+            for cue in source:
+                futures[(target, cue.index)] = stage.submit(cue.text, dest, metrics) if dest else None
+                
+        completed = 0
+        try:
+            for target in targets:
+                document = job.documents[target] = SubtitleDocument()
+                for cue in source:
+                    if job.cancel_flag:
+                        if callback:
+                            callback("status", "Operation cancelled by user.")
+                        return False
+                    future = futures[(target, cue.index)]
+                    text = cue.text
+                    if future is not None:
+                        try:
+                            text = future.result()
+                        except Exception as e:
+                            metrics.error(e)
+                            if callback:
+                                callback("status", f"Error translating cue {cue.index} to {target}: {e}")
+                    document.add(cue.index, cue.start, cue.end, text)
+                    completed += 1
+                    job.progress = completed
+                    metrics.segment_done()
+                    if callback:
+                        callback("progress", completed)
+        finally:
+            for future in futures.values():
+                if future is not None:
+                    future.cancel()
+        job.document = job.documents[targets[0]]
+        
+        # Write each target in a single buffered pass; recording.en-US.srt
+        # translates to recording.fr-FR.srt, not recording.en-US.fr-FR.srt
+        stem, language = os.path.splitext(os.path.splitext(job.input_file)[0])
+        if language[1:] not in set(LANGUAGE_MAP.values()) | {source_lang}:
+            stem += language
+        written = []
+        try:
+            with metrics.timed("write"):
+                for target in targets:
+                    if job.output_file:
+                        target_file = self.target_output_file(job.output_file, target, targets)
+                    else:
+                        target_file = f"{stem}.{target}.srt"
+                    for path in output_paths(target_file, self.output_formats).values():
+                        job.documents[target].save(path)
+                        written.append(path)
+        except OSError as e:
+            if callback:
+                callback("error", f"Could not write output file: {e}")
+            return False
+            
+        if callback:
+            callback("status", f"Translation: {metrics.counters['translated']} strings translated in "
+                               f"{metrics.counters['translation_batches']} batches, "
+                               f"{metrics.counters['translation_reused']} reused.")
+            callback("metrics", metrics.snapshot())
+            callback("complete", ", ".join(written))
+        return True
+    
+    def process_audio(self, input_file, target_lang, segment_length, output_file=None, callback=None, workers=None,
+                      resume=False, source_lang=None, job=None):
         """Process audio file and generate subtitles"""
-        self.cancel_flag = False
-        self.progress = 0
+        if output_file is not None and not os.path.isabs(output_file):
+            output_file = os.path.join(os.path.dirname(os.path.abspath(input_file)), output_file)
+        job = job or self.new_job(input_file, output_file)
+        with self.running(job):
+            return self.process_job(job, target_lang, segment_length, callback, workers, resume, source_lang)
         
+    def process_job(self, job, target_lang, segment_length, callback=None, workers=None, resume=False,
+                    source_lang=None):
+        """Body of process_audio for one registered job"""
+        workers = self.worker_count(workers)
+        metrics = job.metrics = PipelineMetrics(segment_length)
+        targets = [target_lang] if isinstance(target_lang, str) else list(dict.fromkeys(target_lang))
+        source_lang = source_lang or targets[0]
+        
+        try:
+            cache = self.get_cache()
+        except (sqlite3.Error, OSError) as e:
+            cache = None
+            if callback:
+                callback("status", f"Warning: Recognition cache disabled: {e}")
+        self.recognize_governor.set_max_concurrency(workers)
+            
+        # Targets in another language than the source are translated on a separate stage
+        translate_dests = {target: self.translation_dest(source_lang, target) for target in targets}
+        translation_stage = self.get_translation_stage(job) if any(translate_dests.values()) else None
+        
+        problem = self.backend.unavailable()
+        if problem:
+            if callback:
+                callback("error", f"Recognizer backend {self.backend.name} is not available: {problem}")
+            return False
+            
         # Check if ffmpeg is installed
         if not self.check_ffmpeg():
             if callback:
                 callback("error", "ffmpeg not found. Please install ffmpeg and add it to your PATH.")
             return False
+        if callback:
+            callback("status", f"Recognizer: {self.backend.name}, {self.backend.description}; {workers} workers")
             
-        # Set working directory to input file location
-        input_dir = os.path.dirname(os.path.abspath(input_file))
-        os.chdir(input_dir)
-        
-        # Determine input and output filenames
-        input_filename = os.path.basename(input_file)
-        base_filename = os.path.splitext(input_filename)[0]
-        
-        if output_file is None:
-            output_file = f"{base_filename}.srt"
+        # Paths are absolute; by default the output goes next to the input
+        input_file = job.input_file
+        output_file = job.output_file or os.path.splitext(input_file)[0] + ".srt"
             
-        # Convert to WAV if needed
-        wav_file = "transcript.wav"
-        if os.path.exists(wav_file):
+        plan = None
+        if self.decode_mode in ("stream", "seek"):
+            # Decode straight from ffmpeg; no intermediate WAV is written
+            if self.segmentation == "pause" and callback:
+                callback("status", "Warning: Pause-aligned segmentation needs the whole audio (WAV decode mode); "
+                                   "using the fixed grid.")
+            wav_file = None
+            sample_rate = self.audio_profile.sample_rate or RECOGNIZER_SAMPLE_RATE
+            info = self.probe(input_file)
+            duration = info["duration"] if info else None
+            total_segments = int(duration // segment_length) if duration else None
+            if self.decode_mode == "seek" and duration:
+                segments = self.iter_seek_segments(input_file, segment_length, duration, sample_rate)
+                if callback:
+                    callback("status", "Decoding segments in parallel with ffmpeg...")
+            else:
+                if self.decode_mode == "seek" and callback:
+                    callback("status", "Warning: Could not read the input duration; streaming instead.")
+                segments = self.iter_stream_segments(input_file, segment_length, sample_rate)
+                if callback:
+                    callback("status", "Streaming audio from ffmpeg...")
+            if callback:
+                if duration:
+                    callback("status", f"Audio length: {duration:.2f} seconds")
+                    callback("status", f"Processing {total_segments} segments...")
+                    callback("max_progress", total_segments)
+        else:
+            # Convert to a WAV in the job's own temporary directory
             try:
-                os.remove(wav_file)
-            except Exception as e:
+                wav_file = job.temp_file(".transcript.wav")
+            except OSError as e:
                 if callback:
-                    callback("error", f"Could not remove existing transcript.wav: {e}")
+                    callback("error", f"Could not create temporary WAV file: {e}")
+                return False
+                    
+            if callback:
+                callback("status", f"Converting audio file to WAV format ({self.audio_profile.describe()})...")
+                    
+            with metrics.timed("convert"):
+                converted = self.convert_to_wav(input_file, wav_file)
+            if not converted:
+                if callback:
+                    callback("error", "Failed to convert audio file to WAV format.")
                 return False
                 
-        if callback:
-            callback("status", "Converting audio file to WAV format...")
+            # Load audio file
+            try:
+                if callback:
+                    callback("status", "Loading audio file...")
+                    
+                with metrics.timed("load"):
+                    whole_audio = AudioSegment.from_wav(wav_file)
+                    whole_len = len(whole_audio)
+                    samples, sample_rate = self.load_samples(whole_audio)
+                    del whole_audio
+                total_segments = int(whole_len / (segment_length * 1000))
+                if self.segmentation == "pause":
+                    # Variable-length segments cut at pauses; the fixed grid
+                    # count is kept to report the saving
+                    with metrics.timed("slice"):
+                        plan = self.plan_pause_segments(samples, sample_rate, segment_length)
+                    metrics.count("grid_segments", total_segments)
+                    metrics.total_audio_seconds = sum(end - start for start, end in plan) / 1000
+                    grid_segments, total_segments = total_segments, len(plan)
+                    segments = self.iter_planned_segments(samples, sample_rate, plan)
+                else:
+                    segments = self.iter_segments(samples, sample_rate, segment_length)
                 
-        if not self.convert_to_wav(input_file, wav_file):
+                if callback:
+                    callback("status", f"Audio length: {whole_len/1000:.2f} seconds")
+                    if plan is not None:
+                        callback("status", f"Pause-aligned segmentation: {total_segments} requests for "
+                                           f"{metrics.total_audio_seconds:.2f} seconds of speech "
+                                           f"({grid_segments} on the fixed {segment_length}s grid)")
+                    callback("status", f"Processing {total_segments} segments...")
+                    callback("max_progress", total_segments)
+            except Exception as e:
+                if callback:
+                    callback("error", f"Error loading audio file: {e}")
+                return False
+        
+        metrics.total_segments = total_segments
+        
+        # Resume from the checkpoint journal if it matches this input and these settings.
+        # Stream and seek modes have not opened the input yet, so this is the
+        # first place a missing or unreadable file shows up
+        try:
+            journal_header = {
+                "input": SegmentJournal.fingerprint(input_file),
+                "language": source_lang,
+                "targets": targets,
+                "segment_length": segment_length,
+                "backend": self.backend.name,
+                # VAD settings decide which segments were journaled as silent
+                "vad": {"threshold_db": self.vad_threshold_db,
+                        "min_speech_ratio": self.vad_min_speech_ratio} if self.vad_enabled else None,
+            }
+            if plan is not None:
+                # Segment numbers only line up again with the same cut points
+                journal_header["segments"] = hashlib.sha1(json.dumps(plan).encode()).hexdigest()
+            journal = SegmentJournal(f"{output_file}.journal", journal_header)
+            journaled = journal.load() if resume else None
+        except OSError as e:
+            segments.close()
             if callback:
-                callback("error", "Failed to convert audio file to WAV format.")
+                callback("error", f"Could not read input file: {e}")
             return False
-            
-        # Load audio file
+        if journaled is not None and callback:
+            callback("status", f"Resuming: {len(journaled)} segments already completed.")
+        elif resume and callback:
+            callback("status", "No matching journal found, starting from the beginning.")
+        
+        # Open a writer per target and output format (this replaces existing output files)
+        documents = job.documents = {target: SubtitleDocument() for target in targets}
+        job.document = documents[targets[0]]
+        writers = {target: [] for target in targets}
+        all_writers = []
         try:
+            for target in targets:
+                paths = output_paths(self.target_output_file(output_file, target, targets), self.output_formats)
+                for subtitle_format, path in paths.items():
+                    writer = SUBTITLE_WRITERS[subtitle_format](path, self.flush_every)
+                    writers[target].append(writer)
+                    all_writers.append(writer)
+        except Exception as e:
+            for writer in all_writers:
+                writer.close()
             if callback:
-                callback("status", "Loading audio file...")
+                callback("error", f"Could not open output file: {e}")
+            return False
                 
-            whole_audio = AudioSegment.from_wav(wav_file)
-            whole_len = len(whole_audio)
-            total_segments = int(whole_len / (segment_length * 1000))
-            
-            if callback:
-                callback("status", f"Audio length: {whole_len/1000:.2f} seconds")
-                callback("status", f"Processing {total_segments} segments...")
-                callback("max_progress", total_segments)
-        except Exception as e:
+        # Process audio segments. Payloads are built on this thread from the
+        # PCM samples; recognition runs on the worker pool and results pass
+        # through a reorder buffer so cues are written in sequence order.
+        try:
+            journal.start(resume=journaled is not None)
+        except OSError as e:
+            for writer in all_writers:
+                writer.close()
             if callback:
-                callback("error", f"Error loading audio file: {e}")
+                callback("error", f"Could not write journal file: {e}")
             return False
+        journaled = journaled or {}
         
-        # Remove existing output files
-        if os.path.exists(output_file):
-            try:
-                os.remove(output_file)
-            except Exception as e:
-                if callback:
-                    callback("error", f"Could not remove existing output file: {e}")
-                return False
-                
-        # Process audio segments
-        temp_wav = "temp.wav"
         successful_segments = 0
+        completed_segments = 0
+        skipped_segments = 0
+        failed_segments = 0
+        failed_translations = 0
+        seen_segments = 0
+        next_seq = 1
+        in_flight = {}   # future -> (seq, start_time, end_time, target or None for recognition)
+        translated = {}  # seq -> {target: text} while translations are outstanding
+        sources = {}     # seq -> recognized text while translations are outstanding
+        untranslated = {}  # seq -> targets whose translation failed, holding the source text
+        finished = {}    # seq -> (start_time, end_time, {target: text}) or None if dropped
         
-        for seq, start_time, end_time in zip(
-            range(1, total_segments + 1),
-            np.arange(0, whole_len, segment_length * 1000),
-            np.arange(segment_length * 1000, whole_len + segment_length * 1000, segment_length * 1000)
-        ):
-            if self.cancel_flag:
-                if callback:
-                    callback("status", "Operation cancelled by user.")
-                break
-                
-            # Update progress
-            self.progress = seq
+        def drop(seq, start_time, end_time):
+            nonlocal completed_segments
+            finished[seq] = None
+            completed_segments += 1
+            job.progress = completed_segments
+            metrics.segment_done((end_time - start_time) / 1000)
+            if callback:
+                callback("progress", completed_segments)
+                if metrics.due():
+                    callback("metrics", metrics.snapshot())
+                    
+        def complete(seq, start_time, end_time, texts):
+            nonlocal failed_translations
+            drop(seq, start_time, end_time)
+            finished[seq] = (start_time, end_time, texts)
+            source = sources.pop(seq, None)
+            failed = untranslated.pop(seq, None)
+            # Targets whose translation failed keep the source text; the journal
+            # lists them so --resume retries only those
+            retry = {"source": source, "targets": failed} if failed else None
+            if failed:
+                failed_translations += 1
+            with metrics.timed("write"):
+                journal.record(seq, start_time, end_time, texts, retry)
             if callback:
-                callback("progress", seq)
+                callback("status", f"Processed segment {seq}/{total_segments or '?'}")
                 
-            # Ensure end time doesn't exceed audio length
-            if end_time > whole_len:
-                end_time = whole_len
+        def translate(seq, start_time, end_time, text, texts, retry_targets=None):
+            """Send ``text`` to every target still missing from ``texts``"""
+            translated[seq] = texts
+            sources[seq] = text
+            for target, dest in translate_dests.items():
+                if dest and target not in texts and (retry_targets is None or target in retry_targets):
+                    in_flight[translation_stage.submit(text, dest, metrics)] = (seq, start_time, end_time, target)
+        
+        def collect(return_when):
+            nonlocal failed_segments
+            done, _ = wait(list(in_flight), return_when=return_when)
+            for future in done:
+                seq, start_time, end_time, target = in_flight.pop(future)
+                try:
+                    text = future.result()
+                except sr.UnknownValueError:
+                    metrics.count("no_speech")
+                    drop(seq, start_time, end_time)
+                    journal.record(seq, start_time, end_time, None)
+                    if callback:
+                        callback("status", f"No speech detected in segment {seq}")
+                    continue
+                except Exception as e:
+                    metrics.error(e)
+                    if target is not None:
+                        # Only this target failed: it falls back to the source text
+                        # like translate_subtitles, and the other targets are kept
+                        metrics.count("translation_failed")
+                        untranslated.setdefault(seq, []).append(target)
+                        text = sources[seq]
+                        if callback:
+                            callback("status", f"Error translating segment {seq} to {target}: {e}; "
+                                               f"keeping the original text")
+                    else:
+                        failed_segments += 1
+                        drop(seq, start_time, end_time)
+                        if callback:
+                            callback("status", f"Error processing segment {seq}: {e}")
+                        continue
+                    
+                if target is None:
+                    # Recognition finished; fan the text out to every target language.
+                    # Translations overlap with recognition of the next segments.
+                    texts = {target: text for target in targets if not translate_dests[target]}
+                    if len(texts) == len(targets):
+                        complete(seq, start_time, end_time, texts)
+                        continue
+                    translate(seq, start_time, end_time, text, texts)
+                else:
+                    texts = translated[seq]
+                    texts[target] = text
+                    if len(texts) == len(targets):
+                        del translated[seq]
+                        complete(seq, start_time, end_time, texts)
+        
+        def flush():
+            nonlocal next_seq, successful_segments
+            while next_seq in finished:
+                result = finished.pop(next_seq)
+                if result is not None:
+                    start_time, end_time, texts = result
+                    with metrics.timed("write"):
+                        for target in targets:
+                            cue = documents[target].add(next_seq, start_time, end_time, texts[target])
+                            for writer in writers[target]:
+                                writer.write(cue)
+                    successful_segments += 1
+                next_seq += 1
                 
-            # Extract segment
+        # Backends that take several segments per call get them in batches;
+        # each segment still has its own Future, settled when the call returns
+        batch_size = max(1, self.backend.batch_size)
+        batch = []  # (future, audio) not sent yet
+        
+        def settle(call, futures):
             try:
-                new_audio = whole_audio[start_time:end_time]
-                new_audio.export(temp_wav, format="wav")
+                results = call.result()
             except Exception as e:
-                if callback:
-                    callback("status", f"Error extracting segment {seq}: {e}")
-                continue
-                
-            # Transcribe segment
-            try:
-                with sr.AudioFile(temp_wav) as source:
-                    audio = self.recognizer.record(source)
+                results = [e] * len(futures)
+            for future, result in zip(futures, results):
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
                     
-                    # Format times for SRT
-                    start_formatted = self.format_time(start_time)
-                    end_formatted = self.format_time(end_time)
+        def send_batch():
+            if not batch:
+                return
+            futures = [future for future, _ in batch]
+            call = executor.submit(self.recognize_batch, [audio for _, audio in batch], source_lang, job)
+            call.add_done_callback(lambda call: settle(call, futures))
+            batch.clear()
+        
+        decode_failed = False
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            while True:
+                with metrics.timed("slice"):
+                    segment = next(segments, None)
+                if segment is None:
+                    break
+                seq, start_time, end_time, segment_samples = segment
+                seen_segments = seq
+                if job.cancel_flag:
+                    if callback:
+                        callback("status", "Operation cancelled by user.")
+                    break
                     
-                    # Recognize speech
-                    if target_lang.startswith('en'):
-                        transcription = self.recognizer.recognize_google(audio, language=target_lang)
-                        translated_text = transcription
-                    else:
-                        # First recognize in the original language
-                        transcription = self.recognizer.recognize_google(audio, language=target_lang)
-                        # Then translate to the target language if needed
-                        translated_text = self.translator.translate(transcription, dest=target_lang.split('-')[0]).text
-                        
-                    # Write to SRT file
-                    with open(output_file, "a", encoding="utf-8") as f:
-                        f.write(f"{seq}\n{start_formatted} --> {end_formatted}\n{translated_text}\n\n")
-                        
-                    successful_segments += 1
+                # Segments finished by an earlier run come straight from the journal;
+                # only their failed translations are sent again
+                if seq in journaled:
+                    metrics.count("resumed")
+                    _, _, texts, retry = journaled[seq]
+                    if retry and translation_stage is not None:
+                        retry_targets = set(retry["targets"])
+                        translate(seq, start_time, end_time, retry["source"],
+                                  {target: text for target, text in texts.items() if target not in retry_targets},
+                                  retry_targets)
+                        continue
+                    drop(seq, start_time, end_time)
+                    if texts is not None:
+                        finished[seq] = (start_time, end_time, texts)
+                    flush()
+                    continue
+                    
+                # Skip segments without speech before any network call
+                if self.vad_enabled:
+                    with metrics.timed("vad"):
+                        speech = self.has_speech(segment_samples, sample_rate)
+                if self.vad_enabled and not speech:
+                    skipped_segments += 1
+                    metrics.count("skipped")
                     if callback:
-                        callback("status", f"Processed segment {seq}/{total_segments}")
-            except sr.UnknownValueError:
+                        callback("status", f"No speech detected in segment {seq} (skipped)")
+                    drop(seq, start_time, end_time)
+                    journal.record(seq, start_time, end_time, None)
+                    continue
+                    
+                # Extract segment
+                try:
+                    with metrics.timed("export"):
+                        audio = sr.AudioData(segment_samples.tobytes(), sample_rate, SAMPLE_WIDTH)
+                except Exception as e:
+                    metrics.error(e)
+                    if callback:
+                        callback("status", f"Error extracting segment {seq}: {e}")
+                    drop(seq, start_time, end_time)
+                    continue
+                    
+                if batch_size > 1:
+                    future = Future()
+                    batch.append((future, audio))
+                    if len(batch) >= batch_size:
+                        send_batch()
+                else:
+                    future = executor.submit(self.recognize_segment, audio, source_lang, job)
+                in_flight[future] = (seq, start_time, end_time, None)
+                
+                # Keep a bounded number of segments queued ahead of the workers
+                while len(in_flight) >= workers * 2 * batch_size:
+                    collect(FIRST_COMPLETED)
+                    flush()
+        except DecodeError as e:
+            decode_failed = True
+            if callback:
+                callback("error", f"Error decoding audio: {e}")
+            return False
+        finally:
+            if job.cancel_flag or decode_failed:
+                batch.clear()
+                for future in list(in_flight):
+                    if future.cancel():
+                        del in_flight[future]
+            else:
+                send_batch()
+            while in_flight:
+                collect(FIRST_COMPLETED)
+                flush()
+            executor.shutdown(wait=True)
+            segments.close()
+            journal.close()
+            with metrics.timed("write"):
+                for writer in all_writers:
+                    writer.close()
+            
+        if total_segments is None:
+            total_segments = seen_segments
+        if wav_file is None:
+            job.audio_duration = duration or seen_segments * segment_length
+        else:
+            job.audio_duration = whole_len / 1000
+        
+        # A fully successful run needs no checkpoint; otherwise keep it for --resume
+        if not job.cancel_flag and failed_segments == 0 and failed_translations == 0:
+            journal.remove()
+        elif callback:
+            callback("status", f"Progress saved to {journal.path}; run again with --resume to continue.")
+            
+        if callback:
+            if self.vad_enabled:
+                callback("status", f"Skipped {skipped_segments} segments without speech (no recognition request sent).")
+            counters = metrics.counters
+            if cache is not None:
+                callback("cache", {"hits": counters["cache_hits"], "misses": counters["cache_misses"]})
+                callback("status", f"Recognition cache: {counters['cache_hits']} hits, "
+                                   f"{counters['cache_misses']} misses.")
+            if counters["retries"] or counters["gave_up"]:
+                callback("status", f"Recognition: {counters['retries']} retries, {counters['gave_up']} calls gave up, "
+                                   f"concurrency limit now {int(self.recognize_governor.limit)}.")
+            if plan is not None and grid_segments:
+                change = 100 * (len(plan) - grid_segments) / grid_segments
+                callback("status", f"Pause-aligned segmentation: {len(plan)} recognition requests instead of "
+                                   f"{grid_segments} on the fixed grid "
+                                   f"({abs(change):.0f}% {'more' if change > 0 else 'fewer'}).")
+            payload_bytes = metrics.counters["payload_bytes"]
+            callback("status", f"Sent {payload_bytes / 1e6:.1f} MB of PCM audio to the recognizer "
+                               f"({metrics.stage_counts['recognize']} requests).")
+            if translation_stage is not None:
+                callback("status", f"Translation: {counters['translated']} strings translated in "
+                                   f"{counters['translation_batches']} batches, {counters['translation_reused']} reused.")
+                if failed_translations:
+                    callback("status", f"Translation failed for {failed_translations} segments; they keep the "
+                                       f"original text until a --resume run translates them.")
+            callback("status", f"Complete! Successfully processed {successful_segments} out of {total_segments} segments.")
+            callback("metrics", metrics.snapshot())
+            
+        if self.metrics_file:
+            try:
+                metrics.write_report(self.metrics_file)
+            except OSError as e:
                 if callback:
-                    callback("status", f"No speech detected in segment {seq}")
-            except Exception as e:
+                    callback("status", f"Warning: Could not write metrics report: {e}")
+        history = self.get_history()
+        if history is not None:
+            try:
+                history.record(self.backend.name, metrics, job.audio_duration)
+            except OSError as e:
                 if callback:
-                    callback("status", f"Error processing segment {seq}: {e}")
+                    callback("status", f"Warning: Could not record latency history: {e}")
+                    
+        if callback:
+            callback("complete", ", ".join(writer.path for writer in all_writers))
+            
+        return True
         
-        # Clean up temporary files
+    def iter_live_segments(self, stream, sample_rate, next_length):
+        """Yield (seq, start_time, end_time, samples, arrived) as PCM arrives on ``stream``"""
+        seq = 0
+        position = 0  # samples read so far
+        while True:
+            size = max(1, int(next_length() * sample_rate)) * SAMPLE_WIDTH
+            chunk = bytearray()
+            while len(chunk) < size:
+                data = stream.read(size - len(chunk))
+                if not data:
+                    break
+                chunk += data
+            usable = len(chunk) - len(chunk) % SAMPLE_WIDTH
+            if usable == 0:
+                return
+            samples = np.frombuffer(bytes(chunk[:usable]), dtype=np.int16)
+            seq += 1
+            start_time = position * 1000 // sample_rate
+            position += len(samples)
+            yield seq, start_time, position * 1000 // sample_rate, samples, time.monotonic()
+            if len(chunk) < size:
+                return
+                
+    def recognize_live(self, audio, source_lang, translate_dests, job):
+        """Recognize one live segment and translate it; returns {target: text}"""
+        text = self.recognize_segment(audio, source_lang, job)
+        futures = {target: job.translation_stage.submit(text, dest, job.metrics)
+                   for target, dest in translate_dests.items() if dest}
+        return {target: futures[target].result() if target in futures else text
+                for target in translate_dests}
+    
+    def process_live(self, source, target_lang, output_file=None, callback=None, latency=LIVE_LATENCY_BUDGET,
+                     realtime=False, source_lang=None, workers=None, job=None):
+        """Subtitle a live stream, emitting each cue as soon as it is recognized"""
+        job = job or self.new_job(output_file=output_file)
+        with self.running(job):
+            return self.live_job(job, source, target_lang, callback, latency, realtime, source_lang, workers)
+        
+    def live_job(self, job, source, target_lang, callback=None, latency=LIVE_LATENCY_BUDGET, realtime=False,
+                 source_lang=None, workers=None):
+        """Body of process_live for one registered job"""
+        workers = self.worker_count(workers)
+        metrics = job.metrics = PipelineMetrics(latency)
+        targets = [target_lang] if isinstance(target_lang, str) else list(dict.fromkeys(target_lang))
+        source_lang = source_lang or targets[0]
+        sample_rate = self.audio_profile.sample_rate or RECOGNIZER_SAMPLE_RATE
+        translate_dests = {target: self.translation_dest(source_lang, target) for target in targets}
+        if any(translate_dests.values()):
+            # A private stage that never waits for a batch to fill, which would only add delay
+            job.translation_stage = TranslationStage(job.translator or self.translator, batch_wait=0,
+                                                     governor=self.translate_governor)
+        try:
+            self.get_cache()
+        except (sqlite3.Error, OSError) as e:
+            if callback:
+                callback("status", f"Warning: Recognition cache disabled: {e}")
+        self.recognize_governor.set_max_concurrency(workers)
+        problem = self.backend.unavailable()
+        if problem:
+            if callback:
+                callback("error", f"Recognizer backend {self.backend.name} is not available: {problem}")
+            return False
+        
+        process = None
+        if source == "-":
+            stream = sys.stdin.buffer
+        else:
+            if not self.check_ffmpeg():
+                if callback:
+                    callback("error", "ffmpeg not found. Please install ffmpeg and add it to your PATH.")
+                return False
+            process = subprocess.Popen(['ffmpeg', '-nostdin', '-loglevel', 'error']
+                                       + (['-re'] if realtime else []) + ['-i', source,
+                                       '-vn', '-f', 's16le', '-acodec', 'pcm_s16le']
+                                       + self.audio_profile.ffmpeg_args(sample_rate) + ['-'],
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+            stream = process.stdout
+            
+        writers = {target: [] for target in targets}
+        all_writers = []
         try:
-            if os.path.exists(temp_wav):
-                os.remove(temp_wav)
-            if os.path.exists(wav_file):
-                os.remove(wav_file)
+            if job.output_file:
+                for target in targets:
+                    paths = output_paths(self.target_output_file(job.output_file, target, targets),
+                                         self.output_formats)
+                    for subtitle_format, path in paths.items():
+                        writer = SUBTITLE_WRITERS[subtitle_format](path, flush_every=1)
+                        writers[target].append(writer)
+                        all_writers.append(writer)
         except Exception as e:
+            for writer in all_writers:
+                writer.close()
+            if process is not None:
+                process.kill()
+                process.wait()
             if callback:
-                callback("status", f"Warning: Could not remove temporary files: {e}")
+                callback("error", f"Could not open output file: {e}")
+            return False
+            
+        documents = job.documents = {target: SubtitleDocument() for target in targets}
+        job.document = documents[targets[0]]
+        recent_latency = [LIVE_INITIAL_LATENCY]  # moving average of recognition latency
+        started = {}  # seq -> when a worker began recognizing it
+        finished = {}  # seq -> (start_time, end_time, arrived, {target: text} or None)
+        next_seq = [1]
+        delays = []
+        lock = threading.Lock()
+        # One segment per worker at most; reading waits rather than queueing
+        # segments whose wait would count as latency and shrink the next ones
+        slots = threading.BoundedSemaphore(workers)
+        
+        def next_length():
+            return min(LIVE_MAX_SEGMENT, max(LIVE_MIN_SEGMENT, latency - recent_latency[0]))
+        
+        def emit():
+            # Called with the lock held; writes finished cues in sequence order
+            while next_seq[0] in finished:
+                start_time, end_time, arrived, texts = finished.pop(next_seq[0])
+                if texts is not None:
+                    delay = time.monotonic() - arrived
+                    delays.append(delay)
+                    with metrics.timed("write"):
+                        for target in targets:
+                            cue = documents[target].add(len(documents[target]) + 1, start_time, end_time, texts[target])
+                            for writer in writers[target]:
+                                writer.write(cue)
+                            if callback:
+                                callback("cue", dict(cue.to_dict(), target=target, delay=delay))
+                job.progress = next_seq[0]
+                metrics.segment_done((end_time - start_time) / 1000)
+                next_seq[0] += 1
                 
-        if callback:
-            callback("status", f"Complete! Successfully processed {successful_segments} out of {total_segments} segments.")
-            callback("complete", output_file)
+        def recognize(seq, audio):
+            started[seq] = time.monotonic()
+            return self.recognize_live(audio, source_lang, translate_dests, job)
             
+        def finish(seq, start_time, end_time, arrived, future):
+            slots.release()
+            texts = None
+            try:
+                texts = future.result()
+            except sr.UnknownValueError:
+                metrics.count("no_speech")
+            except Exception as e:
+                metrics.error(e)
+                if callback:
+                    callback("status", f"Error processing segment {seq}: {e}")
+            with lock:
+                if seq in started:
+                    recent_latency[0] = 0.7 * recent_latency[0] + 0.3 * (time.monotonic() - started.pop(seq))
+                finished[seq] = (start_time, end_time, arrived, texts)
+                emit()
+                
+        if callback:
+            callback("status", f"Listening on {'stdin' if source == '-' else source} "
+                               f"(latency budget {latency:g}s)...")
+        segments = self.iter_live_segments(stream, sample_rate, next_length)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        ended = False  # the stream ended by itself rather than by cancel or error
+        try:
+            for seq, start_time, end_time, samples, arrived in segments:
+                if job.cancel_flag:
+                    if callback:
+                        callback("status", "Operation cancelled by user.")
+                    break
+                if self.vad_enabled:
+                    with metrics.timed("vad"):
+                        speech = self.has_speech(samples, sample_rate)
+                    if not speech:
+                        metrics.count("skipped")
+                        with lock:
+                            finished[seq] = (start_time, end_time, arrived, None)
+                            emit()
+                        continue
+                audio = sr.AudioData(samples.tobytes(), sample_rate, SAMPLE_WIDTH)
+                slots.acquire()
+                future = executor.submit(recognize, seq, audio)
+                future.add_done_callback(lambda future, seq=seq, start_time=start_time, end_time=end_time,
+                                         arrived=arrived: finish(seq, start_time, end_time, arrived, future))
+            else:
+                ended = True
+        finally:
+            executor.shutdown(wait=True)
+            segments.close()
+            if process is not None:
+                if not ended and process.poll() is None:
+                    process.kill()
+                process.wait()
+                process.stdout.close()
+                process.stderr.close()
+            for writer in all_writers:
+                writer.close()
+                
+        if process is not None and ended and process.returncode and callback:
+            callback("status", f"Warning: ffmpeg exited with code {process.returncode}.")
+        if callback:
+            if delays:
+                callback("status", f"{len(delays)} cues, delay from audio to cue: "
+                                   f"mean {sum(delays) / len(delays):.2f}s, max {max(delays):.2f}s.")
+            callback("metrics", metrics.snapshot())
+            callback("complete", ", ".join(writer.path for writer in all_writers))
         return True
         
     def cancel_processing(self):
-        """Cancel the ongoing processing"""
-        self.cancel_flag = True
+        """Cancel every job this maker is running"""
+        with self.jobs_lock:
+            for job in self.active_jobs:
+                job.cancel()
 
 
 class SubtitleMakerGUI:
     def __init__(self, root):
+        import_tkinter()
         self.root = root
         self.subtitle_maker = SubtitleMaker()
+        # Worker threads only put (message_type, message) here; Tk is touched
+        # solely from drain_events on the main thread
+        self.events = queue.Queue()
         self.setup_ui()
+        self.root.after(GUI_REFRESH_MS, self.drain_events)
         
     def setup_ui(self):
         """Set up the GUI elements"""
@@ -294,6 +2480,25 @@ class SubtitleMakerGUI:
         segment_spin = ttk.Spinbox(lang_frame, from_=1, to=60, textvariable=self.segment_var, width=5)
         segment_spin.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
         
+        ttk.Label(lang_frame, text="Parallel Workers:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        self.workers_var = StringVar(value=str(DEFAULT_WORKERS))
+        workers_spin = ttk.Spinbox(lang_frame, from_=1, to=32, textvariable=self.workers_var, width=5)
+        workers_spin.grid(row=2, column=1, sticky=tk.W, padx=5, pady=5)
+        
+        self.pause_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(lang_frame, text="Cut segments at pauses", variable=self.pause_var).grid(
+            row=3, column=0, columnspan=2, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Label(lang_frame, text="Recognizer:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
+        
+        self.backend_var = StringVar(value=self.subtitle_maker.backend.name)
+        self.model_path = None
+        backend_combo = ttk.Combobox(lang_frame, textvariable=self.backend_var, width=30, state="readonly")
+        backend_combo['values'] = sorted(RECOGNIZER_BACKENDS)
+        backend_combo.grid(row=4, column=1, sticky=tk.W, padx=5, pady=5)
+        backend_combo.bind("<<ComboboxSelected>>", self.select_backend)
+        
         # Progress section
         progress_frame = ttk.LabelFrame(main_frame, text="Progress", padding="10")
         progress_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -324,10 +2529,18 @@ class SubtitleMakerGUI:
         # Add status message
         self.add_status("Welcome to Subtitle Maker. Select an audio file and settings, then click 'Start Processing'.")
         
+    def select_backend(self, event=None):
+        """Size the workers for the chosen recognizer and ask for a model if it needs one"""
+        backend = RECOGNIZER_BACKENDS[self.backend_var.get()]()
+        self.workers_var.set(str(backend.default_workers))
+        if backend.name == "vosk" and not self.model_path:
+            self.model_path = filedialog.askdirectory(title="Select a Vosk model directory") or None
+        self.add_status(f"Recognizer: {backend.name}, {backend.description}")
+        
     def browse_file(self):
         """Open file dialog to select audio file"""
         filetypes = (
-            ("Audio files", "*.mp3 *.wav *.ogg *.m4a *.flac"),
+            ("Audio files", " ".join("*" + extension for extension in AUDIO_EXTENSIONS)),
             ("All files", "*.*")
         )
         
@@ -342,26 +2555,61 @@ class SubtitleMakerGUI:
     
     def add_status(self, message):
         """Add message to status text widget"""
-        self.status_text.insert(tk.END, message + "\n")
+        self.add_lines([message])
+        
+    def add_lines(self, lines):
+        """Append lines to the status log, dropping the oldest past GUI_LOG_LINES"""
+        self.status_text.insert(tk.END, "\n".join(lines) + "\n")
+        excess = int(self.status_text.index("end-1c").split(".")[0]) - 1 - GUI_LOG_LINES
+        if excess > 0:
+            self.status_text.delete("1.0", f"{excess + 1}.0")
         self.status_text.see(tk.END)
-        self.root.update_idletasks()
         
     def update_callback(self, message_type, message):
-        """Callback function for processing updates"""
-        if message_type == "status":
-            self.add_status(message)
-        elif message_type == "error":
-            self.add_status(f"ERROR: {message}")
-            messagebox.showerror("Error", message)
-            self.processing_complete()
-        elif message_type == "progress":
-            self.progress_bar['value'] = message
-        elif message_type == "max_progress":
-            self.progress_bar['maximum'] = message
-        elif message_type == "complete":
-            self.add_status(f"Output saved to: {message}")
-            messagebox.showinfo("Complete", f"Subtitle generation complete!\nOutput saved to: {message}")
-            self.processing_complete()
+        """Callback function for processing updates, safe to call from any thread"""
+        self.events.put((message_type, message))
+        
+    def drain_events(self):
+        """Apply queued worker events in one batch, then reschedule"""
+        lines = deque(maxlen=GUI_LOG_LINES)
+        progress = maximum = None
+        finished = []
+        for _ in range(self.events.qsize()):
+            try:
+                message_type, message = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if message_type == "status":
+                lines.append(message)
+            elif message_type == "error":
+                lines.append(f"ERROR: {message}")
+                finished.append((message_type, message))
+            elif message_type == "progress":
+                progress = message
+            elif message_type == "max_progress":
+                maximum = message
+            elif message_type == "complete":
+                lines.append(f"Output saved to: {message}")
+                finished.append((message_type, message))
+                
+        if maximum is not None:
+            self.progress_bar['maximum'] = maximum
+        if progress is not None:
+            self.progress_bar['value'] = progress
+        if lines:
+            self.add_lines(lines)
+            
+        # Dialogs run a nested event loop, so the next drain is only scheduled
+        # once they are closed
+        try:
+            for message_type, message in finished:
+                if message_type == "error":
+                    messagebox.showerror("Error", message)
+                else:
+                    messagebox.showinfo("Complete", f"Subtitle generation complete!\nOutput saved to: {message}")
+                self.processing_complete()
+        finally:
+            self.root.after(GUI_REFRESH_MS, self.drain_events)
             
     def start_processing(self):
         """Start processing the audio file"""
@@ -383,6 +2631,14 @@ class SubtitleMakerGUI:
             messagebox.showerror("Error", f"Invalid segment length: {e}")
             return
             
+        try:
+            workers = int(self.workers_var.get())
+            if workers < 1:
+                raise ValueError("Worker count must be at least 1")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid worker count: {e}")
+            return
+            
         # Get the language code
         lang_name = self.language_var.get()
         if lang_name not in LANGUAGE_MAP:
@@ -390,6 +2646,12 @@ class SubtitleMakerGUI:
             return
             
         target_lang = LANGUAGE_MAP[lang_name]
+        self.subtitle_maker.segmentation = "pause" if self.pause_var.get() else "fixed"
+        backend_name = self.backend_var.get()
+        if (self.subtitle_maker.backend.name != backend_name
+                or self.subtitle_maker.backend.model_path != self.model_path):
+            self.subtitle_maker.use_backend(backend_name, self.model_path)
+        workers = self.subtitle_maker.worker_count(workers)
         
         # Update UI state
         self.start_button.config(state=tk.DISABLED)
@@ -402,12 +2664,15 @@ class SubtitleMakerGUI:
         self.add_status(f"- Audio file: {audio_file}")
         self.add_status(f"- Target language: {lang_name} ({target_lang})")
         self.add_status(f"- Segment length: {segment_length} seconds")
+        self.add_status(f"- Parallel workers: {workers}")
+        self.add_status(f"- Segmentation: {self.subtitle_maker.segmentation}")
+        self.add_status(f"- Recognizer: {backend_name}")
         self.add_status("Processing started...")
         
         # Run processing in a separate thread to keep UI responsive
         self.processing_thread = threading.Thread(
             target=self.subtitle_maker.process_audio,
-            args=(audio_file, target_lang, segment_length, None, self.update_callback)
+            args=(audio_file, target_lang, segment_length, None, self.update_callback, workers)
         )
         self.processing_thread.daemon = True
         self.processing_thread.start()
@@ -425,42 +2690,334 @@ class SubtitleMakerGUI:
         self.cancel_button.config(state=tk.DISABLED)
 
 
+def add_processing_options(parser):
+    """Options shared by single-file and batch command-line modes"""
+    parser.add_argument("--workers", type=int,
+                        help=f"segments recognized at once (default: {DEFAULT_WORKERS}, or the CPU count for "
+                             "offline backends)")
+    parser.add_argument("--backend", choices=sorted(RECOGNIZER_BACKENDS), default="google",
+                        help="speech recognition engine")
+    parser.add_argument("--model", help="model directory for backends that need one (vosk)")
+    parser.add_argument("--decode", choices=DECODE_MODES, default="wav")
+    parser.add_argument("--decoders", type=int, help="parallel ffmpeg decoders in seek mode (default: CPU count)")
+    parser.add_argument("--vad", action="store_true")
+    parser.add_argument("--vad-threshold", type=float, default=VAD_THRESHOLD_DB)
+    parser.add_argument("--vad-min-ratio", type=float, default=VAD_MIN_SPEECH_RATIO)
+    parser.add_argument("--segmentation", choices=SEGMENTATION_MODES, default="fixed",
+                        help="cut requests on the fixed segment grid or at pauses (WAV mode)")
+    parser.add_argument("--min-pause", type=int, default=PAUSE_MIN_MS,
+                        help="shortest silence in ms that counts as a pause")
+    parser.add_argument("--sample-rate", type=int,
+                        help="rate of the audio sent to the recognizer (default: the backend's, "
+                             f"{RECOGNIZER_SAMPLE_RATE}), 0 to keep the source rate (WAV mode)")
+    parser.add_argument("--highpass", type=int, help="high-pass cutoff in Hz applied before recognition")
+    parser.add_argument("--lowpass", type=int, help="low-pass cutoff in Hz applied before recognition")
+    parser.add_argument("--normalize", action="store_true", help="normalize loudness before recognition")
+    parser.add_argument("--rate-limit", type=float, help="maximum recognition requests per second")
+    parser.add_argument("--translate-rate-limit", type=float, help="maximum translation requests per second")
+    parser.add_argument("--max-retries", type=int, default=GOVERNOR_MAX_RETRIES,
+                        help="retries for a failed recognition or translation request")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--cache-file")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_ENTRIES)
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--source", help="language spoken in the audio (default: the first target language)")
+    parser.add_argument("--format", type=parse_formats,
+                        help="comma-separated output formats: " + ",".join(SUBTITLE_FORMATS)
+                        + " (default: the --output extension, or srt)")
+    parser.add_argument("--flush-every", type=int, default=SUBTITLE_FLUSH_EVERY,
+                        help="cues buffered between writes, 0 to write once at the end")
+    
+
+def parse_languages(value):
+    """Target languages from a comma-separated list such as ``fr-FR,de-DE``"""
+    return list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+    
+
+def parse_formats(value):
+    """argparse type for --format: a comma-separated list of SUBTITLE_FORMATS"""
+    formats = tuple(dict.fromkeys(part.strip().lower() for part in value.split(",") if part.strip()))
+    unknown = [subtitle_format for subtitle_format in formats if subtitle_format not in SUBTITLE_FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"unknown format {', '.join(unknown) or value!r}; "
+                                         f"choose from {', '.join(SUBTITLE_FORMATS)}")
+    return formats
+    
+
+def configure_maker(maker, options):
+    """Apply parsed processing options to a SubtitleMaker"""
+    maker.workers = options.workers
+    maker.use_backend(options.backend, options.model)
+    maker.decode_mode = options.decode
+    maker.decoders = options.decoders
+    if options.sample_rate is None:
+        sample_rate = maker.backend.sample_rate or RECOGNIZER_SAMPLE_RATE
+    else:
+        sample_rate = options.sample_rate or None
+    maker.audio_profile = AudioProfile(sample_rate, options.highpass, options.lowpass, options.normalize)
+    maker.recognize_governor.rate = options.rate_limit
+    maker.translate_governor.rate = options.translate_rate_limit
+    maker.recognize_governor.max_retries = options.max_retries
+    maker.translate_governor.max_retries = options.max_retries
+    maker.vad_enabled = options.vad
+    maker.vad_threshold_db = options.vad_threshold
+    maker.vad_min_speech_ratio = options.vad_min_ratio
+    maker.segmentation = options.segmentation
+    maker.pause_min_ms = options.min_pause
+    maker.cache_enabled = not options.no_cache
+    maker.cache_path = options.cache_file
+    maker.cache_max_entries = options.cache_size
+    maker.output_formats = options.format or default_formats()
+    maker.flush_every = options.flush_every
+    
+
 def run_cli(args):
     """Run in command-line mode"""
-    if len(args) < 4:
-        print("Usage: python submaker.py <audio_file> <language_code> <segment_length>")
-        print("Example: python submaker.py recording.mp3 en-US 10")
+    if len(args) > 1 and args[1] == "--batch":
+        return run_batch(args)
+    if len(args) > 1 and args[1] == "--live":
+        return run_live(args)
+        
+    parser = argparse.ArgumentParser(prog="submaker.py", add_help=False)
+    parser.add_argument("audio_file", nargs="?")
+    parser.add_argument("language_code", nargs="?")
+    parser.add_argument("segment_length", nargs="?")
+    add_processing_options(parser)
+    parser.add_argument("--metrics-json")
+    parser.add_argument("--plan", action="store_true")
+    options = parser.parse_args(args[1:])
+    
+    # An existing subtitle file only needs translating, no segment length
+    if options.language_code and options.audio_file.lower().endswith(tuple("." + f for f in SUBTITLE_FORMATS)):
+        maker = SubtitleMaker()
+        configure_maker(maker, options)
+        
+        def translate_callback(message_type, message):
+            if message_type in ("status", "error"):
+                print(message)
+            elif message_type == "complete":
+                print(f"Output saved to: {message}")
+                
+        ok = maker.translate_subtitles(options.audio_file, parse_languages(options.language_code),
+                                       source_lang=options.source, callback=translate_callback)
+        return 0 if ok else 1
+        
+    if options.segment_length is None:
+        print("Usage: python submaker.py <audio_file> <language_code>[,<language_code>...] <segment_length>")
+        print("       [--source LANG] [--workers N] [--backend google|sphinx|vosk|fake] [--model DIR]")
+        print("       [--decode wav|stream|seek] [--decoders N]")
+        print("       [--vad] [--vad-threshold DBFS] [--vad-min-ratio RATIO] [--segmentation fixed|pause] [--min-pause MS]")
+        print("       [--no-cache] [--cache-file PATH] [--cache-size ENTRIES] [--resume] [--metrics-json PATH]")
+        print("       [--format srt,vtt,json] [--flush-every CUES] [--plan]")
+        print("   or: python submaker.py --batch <language_code> <segment_length> <file|dir|glob>... [--jobs N] [options]")
+        print("   or: python submaker.py --live <-|url|device|file> <language_code> [--latency SECONDS] [--output FILE] [options]")
+        print("   or: python submaker.py <subtitle_file> <language_code>[,<language_code>...] [--source LANG]")
+        print("Example: python submaker.py recording.mp3 en-US 10 --workers 8")
         print("\nAvailable language codes:")
         for name, code in LANGUAGE_MAP.items():
             print(f"  {code} - {name}")
-        return
+        return 2
         
-    audio_file = args[1]
-    lang_code = args[2]
+    audio_file = options.audio_file
+    lang_codes = parse_languages(options.language_code)
     try:
-        segment_length = int(args[3])
+        segment_length = int(options.segment_length)
     except ValueError:
         print("Error: Segment length must be a number in seconds")
-        return
+        return 2
+    if options.workers is not None and options.workers < 1:
+        print("Error: --workers must be at least 1")
+        return 2
         
     maker = SubtitleMaker()
+    configure_maker(maker, options)
+    if options.plan:
+        # Dry run: print the predicted cost as JSON and stop
+        try:
+            print(json.dumps(maker.plan(audio_file, segment_length), indent=2))
+        except DecodeError as e:
+            print(f"Error: {e}")
+            return 1
+        return 0
+    if options.metrics_json:
+        maker.metrics_file = os.path.abspath(options.metrics_json)
     
     def cli_callback(message_type, message):
         if message_type == "status" or message_type == "error":
             print(message)
             
-    print(f"Processing {audio_file} with language {lang_code} and {segment_length}s segments")
-    maker.process_audio(audio_file, lang_code, segment_length, callback=cli_callback)
+    print(f"Processing {audio_file} with language {', '.join(lang_codes)}, {segment_length}s segments "
+          f"and {maker.worker_count()} workers")
+    ok = maker.process_audio(audio_file, lang_codes, segment_length, callback=cli_callback, resume=options.resume,
+                             source_lang=options.source)
+    if maker.metrics is not None:
+        print()
+        print(maker.metrics.summary_table())
+    return 0 if ok else 1
+    
+
+def expand_inputs(patterns):
+    """Resolve files, directories and glob patterns to a sorted list of audio files, largest first"""
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for directory, _, names in os.walk(pattern):
+                files.update(os.path.join(directory, name) for name in names
+                             if name.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.isfile(pattern):
+            files.add(pattern)
+        else:
+            files.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    # Largest first, so long files don't start last and leave the pool idle
+    return sorted((os.path.abspath(path) for path in files), key=lambda path: (-os.path.getsize(path), path))
+
+
+def process_batch_file(audio_file, lang_code, segment_length, options):
+    """Process one file in a batch worker process and return a result summary"""
+    errors = []
+    
+    def batch_callback(message_type, message):
+        if message_type == "error":
+            errors.append(message)
+            
+    started = time.time()
+    try:
+        maker = SubtitleMaker()
+        configure_maker(maker, options)
+        ok = maker.process_audio(audio_file, parse_languages(lang_code), segment_length, callback=batch_callback,
+                                 resume=options.resume, source_lang=options.source)
+    except Exception as e:
+        ok = False
+        errors.append(str(e))
+    return {
+        "file": audio_file,
+        "ok": bool(ok) and not errors,
+        "error": "; ".join(errors),
+        "audio_seconds": (maker.audio_duration or 0) if ok else 0,
+        "wall_seconds": time.time() - started,
+    }
+
+
+def plan_batch(files, options):
+    """Print the plan of every file and the batch totals as JSON"""
+    maker = SubtitleMaker()
+    configure_maker(maker, options)
+    plans = []
+    failed = []
+    for audio_file in files:
+        try:
+            plans.append(maker.plan(audio_file, options.segment_length))
+        except DecodeError as e:
+            failed.append({"file": audio_file, "error": str(e)})
+    totals = {name: sum(plan[name] for plan in plans)
+              for name in ("duration_seconds", "segments", "requests", "upload_bytes", "wall_seconds")}
+    # Files run --jobs at a time, so the batch takes about the total divided by the jobs
+    totals["batch_wall_seconds"] = totals["wall_seconds"] / min(options.jobs, max(1, len(plans)))
+    print(json.dumps({"files": plans, "failed": failed, "totals": totals}, indent=2))
+    return 1 if failed else 0
+    
+
+def run_batch(args):
+    """Process many files across a process pool; returns a non-zero exit code if any failed"""
+    parser = argparse.ArgumentParser(prog="submaker.py --batch")
+    parser.add_argument("language_code")
+    parser.add_argument("segment_length", type=int)
+    parser.add_argument("inputs", nargs="+", help="audio files, directories or glob patterns")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="files processed in parallel (default: CPU count)")
+    parser.add_argument("--plan", action="store_true", help="print the predicted cost of each file as JSON and stop")
+    add_processing_options(parser)
+    options = parser.parse_args(args[2:])
+    if options.jobs < 1 or (options.workers is not None and options.workers < 1):
+        print("Error: --jobs and --workers must be at least 1")
+        return 2
+        
+    files = expand_inputs(options.inputs)
+    if not files:
+        print("Error: No audio files matched")
+        return 2
+    if options.workers is None and not RECOGNIZER_BACKENDS[options.backend].remote:
+        # Offline engines share the CPU cores between the parallel jobs
+        options.workers = max(1, (os.cpu_count() or 1) // options.jobs)
+    if options.plan:
+        return plan_batch(files, options)
+        
+    print(f"Processing {len(files)} files with language {options.language_code}, "
+          f"{options.segment_length}s segments and {options.jobs} parallel jobs")
+    results = []
+    started = time.time()
+    with ProcessPoolExecutor(max_workers=options.jobs) as executor:
+        futures = {executor.submit(process_batch_file, audio_file, options.language_code,
+                                   options.segment_length, options): audio_file
+                   for audio_file in files}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # A worker process died (e.g. killed for memory), which fails every file still queued
+                result = {"file": futures[future], "ok": False, "error": str(e) or type(e).__name__,
+                          "audio_seconds": 0, "wall_seconds": time.time() - started}
+            results.append(result)
+            state = "ok" if result["ok"] else "FAILED"
+            print(f"[{len(results)}/{len(files)}] {state} {result['file']} "
+                  f"({result['audio_seconds']:.0f}s audio in {result['wall_seconds']:.1f}s)")
+    wall_seconds = time.time() - started
+    
+    failed = [result for result in results if not result["ok"]]
+    audio_seconds = sum(result["audio_seconds"] for result in results)
+    print(f"\nProcessed {len(results) - len(failed)} of {len(results)} files in {wall_seconds:.1f}s")
+    print(f"Throughput: {audio_seconds / max(wall_seconds, 1e-9):.1f} audio-seconds per wall-second")
+    for result in failed:
+        print(f"  FAILED {result['file']}: {result['error'] or 'unknown error'}")
+    return 1 if failed else 0
+    
+
+def run_live(args):
+    """Subtitle a live stream; cues go to stdout as SRT, or to growing files with --output"""
+    parser = argparse.ArgumentParser(prog="submaker.py --live")
+    parser.add_argument("input", help='"-" for raw mono 16-bit PCM on stdin, or any ffmpeg input')
+    parser.add_argument("language_code")
+    parser.add_argument("--latency", type=float, default=LIVE_LATENCY_BUDGET,
+                        help="target delay in seconds from speech to cue")
+    parser.add_argument("--output", help="subtitle file that grows as cues arrive")
+    parser.add_argument("--realtime", action="store_true", help="read a file input at its native speed")
+    add_processing_options(parser)
+    options = parser.parse_args(args[2:])
+    if options.workers is not None and options.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        return 2
+        
+    maker = SubtitleMaker()
+    configure_maker(maker, options)
+    if options.format is None:
+        maker.output_formats = default_formats(options.output)
+    targets = parse_languages(options.language_code)
+    
+    def live_callback(message_type, message):
+        if message_type in ("status", "error"):
+            print(message, file=sys.stderr)
+        elif message_type == "cue" and not options.output and message["target"] == targets[0]:
+            print(f"{message['index']}\n{format_timestamp(message['start'])} --> "
+                  f"{format_timestamp(message['end'])}\n{message['text']}\n", flush=True)
+            
+    try:
+        ok = maker.process_live(options.input, targets, options.output,
+                                live_callback, latency=options.latency, realtime=options.realtime,
+                                source_lang=options.source)
+    except KeyboardInterrupt:
+        return 130
+    return 0 if ok else 1
     
 
 if __name__ == "__main__":
     # Check if running in CLI mode or GUI mode
     if len(sys.argv) > 1:
         # CLI mode
-        run_cli(sys.argv)
+        sys.exit(run_cli(sys.argv))
     else:
         # GUI mode
         try:
+            import_tkinter()
             root = tk.Tk()
             app = SubtitleMakerGUI(root)
             root.mainloop()
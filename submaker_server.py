@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Subtitle Maker - Job server
+
+Keeps a pool of warm SubtitleMaker workers in one long-running process and
+takes jobs over a small local HTTP/JSON API, so a job pays neither
+interpreter start-up, imports, the ffmpeg check nor new recognizer and
+translator objects. Progress comes from the usual callback events.
+
+usage
+
+  python submaker_server.py [--host 127.0.0.1] [--port 8765] [--jobs 2] [--queue-size 16]
+                            [processing options, as for submaker_enhanced.py]
+
+API (paths in requests must be absolute)
+
+  POST   /jobs               {"input": "/abs/recording.mp3", "language": "en-US" or ["en-US", "fr-FR"],
+                              "segment_length": 10, "output": "/abs/out.srt", "source": "en-US",
+                              "format": "srt,vtt", "resume": false}
+                             -> 202 {"id": ...}, or 503 when the queue is full
+                             (Content-Type must be application/json)
+  GET    /jobs               every known job
+  GET    /jobs/<id>          state, progress, recent messages, metrics and output files
+  GET    /jobs/<id>/result   subtitle text; ?target=fr-FR&format=vtt picks the file
+  DELETE /jobs/<id>          cancel a queued or running job
+  GET    /health             workers, backend, queue length and ffmpeg status
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import argparse
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from submaker_enhanced import (SubtitleMaker, add_processing_options, configure_maker, default_formats,
+                               output_paths, parse_formats, parse_languages)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Warm SubtitleMaker workers, jobs waiting for one, finished jobs remembered
+# for polling, and status messages kept per job
+DEFAULT_JOBS = 2
+DEFAULT_QUEUE_SIZE = 16
+JOB_HISTORY = 200
+JOB_MESSAGES = 50
+
+CONTENT_TYPES = {"srt": "application/x-subrip", "vtt": "text/vtt", "json": "application/json"}
+
+
+class Job:
+    """One submitted recording and everything reported about it so far"""
+
+    def __init__(self, input_file, languages, segment_length, output_file, source_lang=None,
+                 formats=("srt",), resume=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.input_file = input_file
+        self.languages = languages
+        self.segment_length = segment_length
+        self.output_file = output_file
+        self.source_lang = source_lang
+        self.formats = formats
+        self.resume = resume
+        self.state = "queued"  # queued, running, done, failed or cancelled
+        self.progress = 0
+        self.max_progress = None
+        self.messages = deque(maxlen=JOB_MESSAGES)
+        self.metrics = None
+        self.outputs = {}  # target -> {format: path}
+        self.error = None
+        self.audio_seconds = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.engine_job = None  # SubtitleJob while running
+        self.cancel_requested = False
+
+    def callback(self, message_type, message):
+        """SubtitleMaker callback: record the event for polling"""
+        if message_type == "status":
+            self.messages.append(message)
+        elif message_type == "error":
+            self.error = message
+            self.messages.append(message)
+        elif message_type == "progress":
+            self.progress = message
+        elif message_type == "max_progress":
+            self.max_progress = message
+        elif message_type == "metrics":
+            self.metrics = message
+
+    def to_dict(self, detail=True):
+        job = {
+            "id": self.id,
+            "state": self.state,
+            "input": self.input_file,
+            "languages": self.languages,
+            "progress": self.progress,
+            "max_progress": self.max_progress,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+        if detail:
+            job.update(segment_length=self.segment_length, source=self.source_lang, formats=list(self.formats),
+                       outputs=self.outputs, audio_seconds=self.audio_seconds,
+                       messages=list(self.messages), metrics=self.metrics)
+        return job
+
+
+class JobServer:
+    """A bounded job queue served by ``jobs`` threads, each with its own warm SubtitleMaker"""
+
+    def __init__(self, options, jobs=DEFAULT_JOBS, queue_size=DEFAULT_QUEUE_SIZE):
+        self.options = options
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = OrderedDict()  # id -> Job, oldest first
+        self.lock = threading.Lock()
+        self.makers = []
+        for _ in range(max(1, jobs)):
+            maker = SubtitleMaker()
+            configure_maker(maker, options)
+            self.makers.append(maker)
+        self.threads = []
+        self.ffmpeg_available = False
+
+    def start(self):
+        """Check ffmpeg (once for the whole process), warm every maker up and start the worker threads
+        
+        Jobs may ask for any target language, so each maker's translator is
+        created up front as well.
+        """
+        self.ffmpeg_available = self.makers[0].check_ffmpeg()
+        for maker in self.makers:
+            try:
+                maker.warm_up()
+            except ImportError as e:
+                print(f"Warning: could not warm up a worker: {e}", file=sys.stderr)
+        for number, maker in enumerate(self.makers, 1):
+            thread = threading.Thread(target=self.work, args=(maker,), name=f"submaker-worker-{number}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self.ffmpeg_available
+
+    def stop(self):
+        """Cancel running jobs and let the worker threads exit"""
+        for maker in self.makers:
+            maker.cancel_processing()
+        for _ in self.threads:
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                break
+
+    def submit(self, request):
+        """Queue a job from a request dict; raises ValueError for a bad request, queue.Full when busy"""
+        input_file = request.get("input")
+        if not isinstance(input_file, str) or not os.path.isabs(input_file):
+            raise ValueError('"input" must be an absolute path')
+        if not os.path.isfile(input_file):
+            raise ValueError(f"input file not found: {input_file}")
+        languages = request.get("language")
+        if isinstance(languages, str):
+            languages = parse_languages(languages)
+        if not isinstance(languages, list) or not languages or not all(isinstance(language, str) for language in languages):
+            raise ValueError('"language" must be a language code or a list of them')
+        try:
+            segment_length = int(request.get("segment_length", 10))
+        except (TypeError, ValueError):
+            raise ValueError('"segment_length" must be a number of seconds')
+        if segment_length < 1:
+            raise ValueError('"segment_length" must be at least 1')
+        output_file = request.get("output") or os.path.splitext(input_file)[0] + ".srt"
+        if not isinstance(output_file, str) or not os.path.isabs(output_file):
+            raise ValueError('"output" must be an absolute path')
+        if not isinstance(request.get("source") or "", str):
+            raise ValueError('"source" must be a language code')
+        if not isinstance(request.get("resume", False), bool):
+            raise ValueError('"resume" must be true or false')
+        formats = self.options.format or default_formats(output_file)
+        if request.get("format"):
+            if not isinstance(request["format"], str):
+                raise ValueError('"format" must be a comma-separated list of formats')
+            try:
+                formats = parse_formats(request["format"])
+            except argparse.ArgumentTypeError as e:
+                raise ValueError(str(e))
+
+        job = Job(input_file, list(languages), segment_length, output_file, request.get("source"),
+                  formats, request.get("resume", False))
+        with self.lock:
+            self.queue.put_nowait(job)
+            self.jobs[job.id] = job
+            self.forget_finished()
+        return job
+
+    def forget_finished(self):
+        """Drop the oldest finished jobs beyond JOB_HISTORY (lock held)"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished is not None]
+        for job_id in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns the job or None if unknown"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_requested = True
+        if job.state == "queued":
+            job.state = "cancelled"
+            job.finished = time.time()
+        elif job.state == "running" and job.engine_job is not None:
+            job.engine_job.cancel()
+        return job
+
+    def work(self, maker):
+        """Worker thread: run queued jobs on this thread's SubtitleMaker"""
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            if job.cancel_requested:
+                continue
+            self.run(maker, job)
+
+    def run(self, maker, job):
+        job.state = "running"
+        job.started = time.time()
+        job.engine_job = maker.new_job(job.input_file, job.output_file)
+        maker.output_formats = job.formats
+        try:
+            ok = not job.cancel_requested and maker.process_audio(
+                job.input_file, job.languages, job.segment_length, job.output_file, job.callback,
+                resume=job.resume, source_lang=job.source_lang, job=job.engine_job)
+        except Exception as e:
+            ok = False
+            job.error = str(e)
+        finally:
+            maker.output_formats = self.options.format or default_formats()
+
+        if ok:
+            job.audio_seconds = job.engine_job.audio_duration
+            job.outputs = {target: output_paths(maker.target_output_file(job.output_file, target, job.languages),
+                                                job.formats)
+                           for target in job.languages}
+        job.state = "cancelled" if job.cancel_requested else "done" if ok else "failed"
+        job.finished = time.time()
+
+    def health(self):
+        with self.lock:
+            states = [job.state for job in self.jobs.values()]
+        return {
+            "workers": len(self.makers),
+            "backend": self.options.backend,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "running": states.count("running"),
+            "ffmpeg": self.ffmpeg_available,
+        }
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON API in front of the JobServer at ``self.server.jobs``"""
+
+    server_version = "submaker"
+
+    def send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def route(self):
+        """Split the path into its parts and query, e.g. (["jobs", "<id>"], {...})"""
+        url = urlparse(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def do_GET(self):
+        parts, query = self.route()
+        jobs = self.server.jobs
+        if parts == ["health"]:
+            return self.send_json(200, jobs.health())
+        if parts == ["jobs"]:
+            return self.send_json(200, {"jobs": [job.to_dict(detail=False) for job in jobs.list()]})
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = jobs.get(parts[1])
+            if job is None:
+                return self.send_json(404, {"error": "unknown job"})
+            if len(parts) == 2:
+                return self.send_json(200, job.to_dict())
+            if parts[2] == "result":
+                return self.send_result(job, query)
+        self.send_json(404, {"error": "not found"})
+
+    def send_result(self, job, query):
+        if job.state != "done":
+            return self.send_json(409, {"error": f"job is {job.state}", "state": job.state})
+        target = query.get("target", [job.languages[0]])[0]
+        subtitle_format = query.get("format", [job.formats[0]])[0]
+        path = job.outputs.get(target, {}).get(subtitle_format)
+        if path is None:
+            return self.send_json(404, {"error": f"no {subtitle_format} output for {target}"})
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            return self.send_json(410, {"error": f"could not read {path}: {e}"})
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES[subtitle_format] + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        parts, _ = self.route()
+        if parts != ["jobs"]:
+            return self.send_json(404, {"error": "not found"})
+        # A browser can send a cross-origin form or text/plain POST without a
+        # preflight, but not a JSON one; this keeps web pages from queueing jobs
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return self.send_json(415, {"error": "Content-Type must be application/json"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            job = self.server.jobs.submit(request)
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        except queue.Full:
+            return self.send_json(503, {"error": "job queue is full, try again later"})
+        self.send_json(202, {"id": job.id, "state": job.state})
+
+    def do_DELETE(self):
+        parts, _ = self.route()
+        if len(parts) != 2 or parts[0] != "jobs":
+            return self.send_json(404, {"error": "not found"})
+        job = self.server.jobs.cancel(parts[1])
+        if job is None:
+            return self.send_json(404, {"error": "unknown job"})
+        self.send_json(200, {"id": job.id, "state": job.state})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="submaker_server.py")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="jobs run at once, one warm worker each")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="jobs waiting for a worker")
+    parser.add_argument("--verbose", action="store_true", help="log every HTTP request")
+    add_processing_options(parser)
+    options = parser.parse_args(args)
+    if options.jobs < 1 or options.queue_size < 1 or (options.workers is not None and options.workers < 1):
+        print("Error: --jobs, --queue-size and --workers must be at least 1")
+        return 2
+
+    jobs = JobServer(options, options.jobs, options.queue_size)
+    if not jobs.start():
+        print("Warning: ffmpeg not found; jobs will fail until it is installed and on PATH")
+    httpd = ThreadingHTTPServer((options.host, options.port), JobRequestHandler)
+    httpd.daemon_threads = True
+    httpd.jobs = jobs
+    httpd.verbose = options.verbose
+    print(f"Listening on http://{options.host}:{httpd.server_address[1]} "
+          f"with {options.jobs} workers and room for {options.queue_size} queued jobs")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down")
+    finally:
+        httpd.server_close()
+        jobs.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
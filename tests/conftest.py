@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def private_cache(tmp_path, monkeypatch):
+    """Keep the recognition cache and latency history out of the user's home"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
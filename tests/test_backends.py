@@ -0,0 +1,79 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from submaker_enhanced import (DEFAULT_WORKERS, RECOGNIZER_BACKENDS, RECOGNIZER_SAMPLE_RATE, FakeBackend,
+                               GoogleBackend, RecognitionCache, SubtitleMaker, sr)
+
+
+class StubGoogleBackend(GoogleBackend):
+    """GoogleBackend that answers locally"""
+    
+    def recognize(self, recognizer, audio, language):
+        return "google"
+    
+    
+class OtherFakeBackend(FakeBackend):
+    name = "other"
+
+
+@pytest.fixture
+def maker(tmp_path):
+    maker = SubtitleMaker()
+    maker.cache_path = str(tmp_path / "recognition.sqlite")
+    return maker
+
+
+def speech(seconds=1):
+    samples = np.random.default_rng(2).integers(-8000, 8000, seconds * RECOGNIZER_SAMPLE_RATE, dtype=np.int16)
+    return sr.AudioData(samples.tobytes(), RECOGNIZER_SAMPLE_RATE, 2)
+
+
+def test_registry_names():
+    assert set(RECOGNIZER_BACKENDS) == {"google", "sphinx", "vosk", "fake"}
+    assert all(backend.name == name for name, backend in RECOGNIZER_BACKENDS.items())
+    
+    
+def test_unavailable(maker, tmp_path):
+    assert maker.use_backend("fake").unavailable() is None
+    assert maker.use_backend("google").unavailable() is None
+    sphinx = maker.use_backend("sphinx").unavailable()
+    assert (sphinx is None) == (importlib.util.find_spec("pocketsphinx") is not None)
+    vosk = maker.use_backend("vosk", str(tmp_path / "no-model")).unavailable()
+    assert vosk is not None
+    if importlib.util.find_spec("vosk") is not None:
+        assert "--model" in vosk
+        
+        
+def test_worker_count_respects_the_backend_cap(maker):
+    maker.use_backend("google")
+    assert maker.worker_count() == DEFAULT_WORKERS
+    assert maker.worker_count(32) == 32
+    maker.use_backend("sphinx")
+    cap = maker.backend.max_concurrency
+    assert maker.worker_count(cap + 8) == cap
+    assert maker.worker_count() == maker.backend.default_workers
+    
+    
+def test_use_backend_switches_the_sample_rate(maker):
+    maker.audio_profile.sample_rate = 44100
+    maker.use_backend("vosk")
+    assert maker.audio_profile.sample_rate == RECOGNIZER_BACKENDS["vosk"].sample_rate
+    maker.use_backend("fake")  # takes any rate, so keeps the current one
+    assert maker.audio_profile.sample_rate == RECOGNIZER_BACKENDS["vosk"].sample_rate
+    
+    
+def test_cache_keys_are_per_backend(maker):
+    audio = speech()
+    cache = maker.get_cache()
+    maker.backend = FakeBackend()
+    assert maker.recognize_segment(audio, "en-US").startswith("en-US ")
+    maker.backend = OtherFakeBackend()
+    maker.recognize_segment(audio, "en-US")
+    maker.backend = StubGoogleBackend()
+    assert maker.recognize_segment(audio, "en-US") == "google"
+    assert cache.size == 3
+    # Google keeps the keys of the versions before the registry
+    assert cache.get(RecognitionCache.make_key(audio.frame_data, audio.sample_rate, "en-US")) == (True, "google")
+    assert cache.get(RecognitionCache.make_key(audio.frame_data, audio.sample_rate, "fake:en-US"))[0]
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from submaker_enhanced import PipelineMetrics, RequestGovernor
+
+
+class Throttled(Exception):
+    pass
+
+
+class Flaky:
+    """Raises Throttled for the first ``failures`` calls, then returns "ok" """
+    
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+        
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise Throttled()
+        return "ok"
+
+
+def make_governor(**options):
+    settings = dict(max_concurrency=4, max_retries=3, backoff_base=0.001, backoff_max=0.001,
+                    retryable=(Throttled,))
+    settings.update(options)
+    return RequestGovernor(**settings)
+
+
+def test_retries_until_success():
+    governor = make_governor()
+    metrics = PipelineMetrics(10)
+    flaky = Flaky(failures=2)
+    assert governor.call(flaky, metrics=metrics) == "ok"
+    assert flaky.calls == 3
+    assert metrics.counters["retries"] == 2
+    assert metrics.counters["gave_up"] == 0
+    assert governor.active == 0
+
+
+def test_gives_up_after_max_retries():
+    governor = make_governor()
+    metrics = PipelineMetrics(10)
+    flaky = Flaky(failures=100)
+    with pytest.raises(Throttled):
+        governor.call(flaky, metrics=metrics)
+    assert flaky.calls == governor.max_retries + 1
+    assert metrics.counters["retries"] == governor.max_retries
+    assert metrics.counters["gave_up"] == 1
+    assert governor.active == 0
+    assert governor.waiting_retries == 0
+
+
+def test_other_errors_are_not_retried():
+    governor = make_governor()
+    calls = []
+    
+    def no_speech():
+        calls.append(1)
+        raise ValueError("no speech")
+        
+    with pytest.raises(ValueError):
+        governor.call(no_speech)
+    assert len(calls) == 1
+    assert governor.limit == 4  # an answer, not overload
+
+
+def test_limit_halves_on_throttling_and_grows_back():
+    governor = make_governor(max_retries=0)
+    with pytest.raises(Throttled):
+        governor.call(Flaky(failures=1))
+    assert governor.limit == 2
+    governor.call(Flaky(failures=0))
+    assert governor.limit == 2.5
+    for _ in range(20):
+        governor.call(Flaky(failures=0))
+    assert governor.limit == 4
+
+
+def test_one_decrease_per_backoff_period():
+    governor = make_governor(max_retries=0)
+    governor.backoff_base = 60
+    for _ in range(3):
+        with pytest.raises(Throttled):
+            governor.call(Flaky(failures=1))
+    assert governor.limit == 2
+
+
+def test_rate_limit_spaces_calls():
+    governor = make_governor(rate=50, burst=1)
+    started = time.monotonic()
+    for _ in range(6):
+        governor.call(Flaky(failures=0))
+    # One call from the initial token, then one every 1/50 s
+    assert time.monotonic() - started >= 5 / 50 * 0.9
@@ -0,0 +1,58 @@
+import shutil
+
+import pytest
+
+from submaker_enhanced import SegmentJournal, SubtitleMaker
+
+HEADER = {"input": "abc", "language": "en-US", "targets": ["en-US"], "segment_length": 10}
+
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / "out.srt.journal")
+    journal = SegmentJournal(path, HEADER)
+    journal.start()
+    journal.record(1, 0, 10000, "one")
+    journal.record(2, 10000, 20000, None)
+    journal.record(3, 20000, 30000, "trois", retry={"source": "three", "targets": ["fr-FR"]})
+    journal.close()
+    assert SegmentJournal(path, HEADER).load() == {
+        1: (0, 10000, "one", None),
+        2: (10000, 20000, None, None),
+        3: (20000, 30000, "trois", {"source": "three", "targets": ["fr-FR"]}),
+    }
+    assert SegmentJournal(path, dict(HEADER, segment_length=5)).load() is None
+    
+    
+def test_journal_torn_line_is_truncated(tmp_path):
+    path = str(tmp_path / "out.srt.journal")
+    journal = SegmentJournal(path, HEADER)
+    journal.start()
+    journal.record(1, 0, 10000, "one")
+    journal.close()
+    with open(path, "rb") as f:
+        valid = f.read()
+    with open(path, "ab") as f:
+        f.write(b'{"seq": 2, "start": 10000, "en')  # crash mid-write
+        
+    journal = SegmentJournal(path, HEADER)
+    assert journal.load() == {1: (0, 10000, "one", None)}
+    with open(path, "rb") as f:
+        assert f.read() == valid
+    journal.start(resume=True)
+    journal.record(2, 10000, 20000, "two")
+    journal.close()
+    assert SegmentJournal(path, HEADER).load() == {1: (0, 10000, "one", None), 2: (10000, 20000, "two", None)}
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+@pytest.mark.parametrize("decode_mode", ["wav", "stream", "seek"])
+def test_missing_input_is_reported(tmp_path, decode_mode):
+    maker = SubtitleMaker()
+    maker.use_backend("fake")
+    maker.decode_mode = decode_mode
+    events = []
+    ok = maker.process_audio(str(tmp_path / "missing.wav"), "en-US", 10, str(tmp_path / "out.srt"),
+                             lambda message_type, message: events.append(message_type))
+    assert ok is False
+    assert "error" in events
+    assert not (tmp_path / "out.srt.journal").exists()
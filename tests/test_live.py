@@ -0,0 +1,32 @@
+import shutil
+
+import pytest
+
+from submaker_enhanced import default_formats, run_live
+from test_reorder import write_input
+
+
+def test_default_formats_follow_the_output_extension():
+    assert default_formats("/out/live.VTT") == ("vtt",)
+    assert default_formats("/out/live.txt") == ("srt",)
+    assert default_formats() == ("srt",)
+    
+    
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_stdout_is_srt_of_the_first_target(tmp_path, capsys):
+    input_file = str(tmp_path / "input.wav")
+    write_input(input_file, seconds=6)
+    assert run_live(["submaker.py", "--live", input_file, "en-US,en-GB", "--backend", "fake", "--latency", "2"]) == 0
+    blocks = capsys.readouterr().out.strip().split("\n\n")
+    assert [block.split("\n")[0] for block in blocks] == [str(index) for index in range(1, len(blocks) + 1)]
+    assert all(block.split("\n")[2].startswith("en-US ") for block in blocks)
+    
+    
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_output_extension_picks_the_format(tmp_path):
+    input_file = str(tmp_path / "input.wav")
+    write_input(input_file, seconds=4)
+    assert run_live(["submaker.py", "--live", input_file, "en-US", "--backend", "fake",
+                     "--output", str(tmp_path / "live.vtt")]) == 0
+    assert (tmp_path / "live.vtt").read_text(encoding="utf-8").startswith("WEBVTT")
+    assert not (tmp_path / "live.srt").exists()
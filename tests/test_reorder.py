@@ -0,0 +1,71 @@
+import shutil
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from submaker_enhanced import FakeBackend, SubtitleDocument, SubtitleMaker
+
+
+class OutOfOrderBackend(FakeBackend):
+    """FakeBackend that holds the first segment back until a later one has finished"""
+    
+    name = "out-of-order"
+    batch_size = 1
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.later_done = threading.Event()
+        self.held = None
+        self.completed = []
+        
+    def recognize(self, recognizer, audio, language):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            self.held = audio.frame_data
+            self.later_done.wait(5)
+        try:
+            return super().recognize(recognizer, audio, language)
+        finally:
+            with self.lock:
+                self.completed.append(audio.frame_data)
+            if not first:
+                self.later_done.set()
+                
+                
+def write_input(path, seconds=20, rate=16000):
+    noise = np.random.default_rng(1).integers(-8000, 8000, seconds * rate, dtype=np.int16)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(noise.tobytes())
+        
+        
+def transcribe(backend, input_file, output_file, workers):
+    maker = SubtitleMaker()
+    maker.backend = backend
+    maker.cache_enabled = False
+    maker.history_enabled = False
+    assert maker.process_audio(input_file, "en-US", 2, output_file, workers=workers)
+    return [(cue.index, cue.start, cue.end, cue.text) for cue in SubtitleDocument.load(output_file)]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_cues_are_written_in_order_when_segments_finish_out_of_order(tmp_path):
+    input_file = str(tmp_path / "input.wav")
+    write_input(input_file)
+    backend = OutOfOrderBackend()
+    concurrent = transcribe(backend, input_file, str(tmp_path / "concurrent.srt"), workers=4)
+    sequential = transcribe(FakeBackend(), input_file, str(tmp_path / "sequential.srt"), workers=1)
+    
+    assert backend.calls == 10
+    assert backend.completed[0] != backend.held  # segments did finish out of order
+    assert concurrent == sequential
+    assert [cue[0] for cue in concurrent] == list(range(1, 11))
+    assert [cue[1] for cue in concurrent] == list(range(0, 20000, 2000))
+    assert not (tmp_path / "concurrent.srt.journal").exists()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from submaker_enhanced import PAUSE_MAX_STRETCH, PAUSE_PADDING_MS, VAD_FRAME_MS, SubtitleMaker
+
+RATE = 16000
+
+
+def audio(*parts):
+    """Concatenate ("speech" | "silence", seconds) parts into int16 samples"""
+    noise = np.random.default_rng(0)
+    chunks = []
+    for kind, seconds in parts:
+        count = int(seconds * RATE)
+        if kind == "speech":
+            chunks.append(noise.integers(-8000, 8000, count, dtype=np.int16))
+        else:
+            chunks.append(np.zeros(count, dtype=np.int16))
+    return np.concatenate(chunks)
+
+
+@pytest.fixture
+def maker():
+    return SubtitleMaker()
+
+
+def test_silence_and_empty_input(maker):
+    assert maker.plan_pause_segments(np.zeros(0, dtype=np.int16), RATE, 10) == []
+    assert maker.plan_pause_segments(audio(("silence", 5)), RATE, 10) == []
+
+
+def test_continuous_speech_is_cut_without_gaps(maker):
+    segments = maker.plan_pause_segments(audio(("speech", 60)), RATE, 10)
+    assert segments[0][0] == 0
+    assert segments[-1][1] == 60000
+    for (_, end), (start, _) in zip(segments, segments[1:]):
+        assert start == end
+    for start, end in segments:
+        assert 0 < end - start <= 10000 * PAUSE_MAX_STRETCH
+        
+        
+def test_long_gap_is_not_sent(maker):
+    samples = audio(("silence", 1), ("speech", 2), ("silence", 10), ("speech", 2), ("silence", 1))
+    segments = maker.plan_pause_segments(samples, RATE, 10)
+    expected = [(1000 - PAUSE_PADDING_MS, 3000 + PAUSE_PADDING_MS),
+                (13000 - PAUSE_PADDING_MS, 15000 + PAUSE_PADDING_MS)]
+    assert len(segments) == len(expected)
+    # Cut points are whole VAD frames
+    for segment, bounds in zip(segments, expected):
+        assert all(abs(got - want) < VAD_FRAME_MS for got, want in zip(segment, bounds))
+
+
+def test_cuts_at_pauses(maker):
+    parts = [("speech", 4), ("silence", 0.5)] * 8
+    segments = maker.plan_pause_segments(audio(*parts), RATE, 10)
+    pauses = [(4000 + 4500 * number, 4500 + 4500 * number) for number in range(8)]
+    # Every cut falls inside a pause, never in the middle of speech
+    for (_, end), (start, _) in zip(segments, segments[1:]):
+        assert any(pause_start <= start and end <= pause_end for pause_start, pause_end in pauses)
+    # Requests run past the target length to the next pause
+    assert len(segments) < len(parts) // 2
+    for start, end in segments[:-1]:
+        assert 10000 <= end - start <= 10000 * PAUSE_MAX_STRETCH + 2 * PAUSE_PADDING_MS
+
+
+def test_gaps_shorter_than_max_gap_stay_in_one_request(maker):
+    samples = audio(("speech", 2), ("silence", 2), ("speech", 2))
+    assert len(maker.plan_pause_segments(samples, RATE, 10)) == 1
+    maker.pause_max_gap = 1.0
+    assert len(maker.plan_pause_segments(samples, RATE, 10)) == 2
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+
+from submaker_enhanced import SubtitleDocument, SubtitleMaker, TranslationStage
+
+
+WORKING = object()
+
+
+class ListTranslator:
+    """Translates a list of strings by upper-casing, or returns ``results`` as given"""
+    
+    def __init__(self, results=WORKING):
+        self.results = results
+        self.calls = 0
+        
+    def translate(self, texts, dest):
+        self.calls += 1
+        if self.results is not WORKING:
+            return self.results
+        return [SimpleNamespace(text=f"{dest}:{text.upper()}") for text in texts]
+
+
+def test_batches_and_memoizes():
+    translator = ListTranslator()
+    stage = TranslationStage(translator, batch_wait=0.05)
+    try:
+        futures = [stage.submit(text, "fr") for text in ("a", "b", "a")]
+        assert [future.result(5) for future in futures] == ["fr:A", "fr:B", "fr:A"]
+        assert stage.submit("b", "fr").result(5) == "fr:B"
+        assert translator.calls == 1
+    finally:
+        stage.close()
+        
+        
+@pytest.mark.parametrize("results", [None, [], [SimpleNamespace()]])
+def test_bad_translator_results_fail_the_futures(results):
+    stage = TranslationStage(ListTranslator(results), batch_wait=0)
+    try:
+        with pytest.raises(Exception):
+            stage.submit("hello", "fr").result(5)
+        # The stage is still serving after a bad batch
+        stage.translator = ListTranslator()
+        assert stage.submit("hello", "fr").result(5) == "fr:HELLO"
+    finally:
+        stage.close()
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("recording.en-US.srt", "recording.{}.srt"),
+    ("recording.part1.srt", "recording.part1.{}.srt"),
+])
+def test_translated_files_replace_the_language_suffix(tmp_path, name, expected):
+    document = SubtitleDocument()
+    document.add(1, 0, 1000, "Hello")
+    subtitle_file = str(tmp_path / name)
+    document.save(subtitle_file)
+    # English variants need no translator
+    assert SubtitleMaker().translate_subtitles(subtitle_file, ["en-GB", "en-IN"], source_lang="en-US")
+    for target in ("en-GB", "en-IN"):
+        assert (tmp_path / expected.format(target)).exists()
@@ -0,0 +1,56 @@
+import pytest
+
+from submaker_enhanced import Cue, SrtWriter, SubtitleDocument, output_paths
+
+CUES = [
+    (1, 0, 1500, "Hello"),
+    (2, 1500, 4250, "Two lines\nof text"),
+    (3, 3_725_001, 3_726_999, "Über → 字幕"),
+]
+
+
+def make_document():
+    document = SubtitleDocument()
+    for cue in CUES:
+        document.add(*cue)
+    return document
+
+
+@pytest.mark.parametrize("subtitle_format", ["srt", "vtt", "json"])
+def test_save_load_round_trip(tmp_path, subtitle_format):
+    path = str(tmp_path / f"out.{subtitle_format}")
+    make_document().save(path)
+    loaded = SubtitleDocument.load(path)
+    assert [(cue.index, cue.start, cue.end, cue.text) for cue in loaded] == CUES
+
+
+def test_save_format_overrides_extension(tmp_path):
+    path = str(tmp_path / "out.txt")
+    make_document().save(path, "vtt")
+    with open(path, encoding="utf-8") as f:
+        assert f.readline() == "WEBVTT\n"
+
+
+def test_empty_document_round_trip(tmp_path):
+    for subtitle_format in ("srt", "vtt", "json"):
+        path = str(tmp_path / f"empty.{subtitle_format}")
+        SubtitleDocument().save(path)
+        assert len(SubtitleDocument.load(path)) == 0
+
+
+def test_writer_flushes_every_n_cues(tmp_path):
+    path = tmp_path / "out.srt"
+    writer = SrtWriter(str(path), flush_every=2)
+    writer.write(Cue(*CUES[0]))
+    assert path.read_text(encoding="utf-8") == ""
+    writer.write(Cue(*CUES[1]))
+    assert path.read_text(encoding="utf-8").count("-->") == 2
+    writer.write(Cue(*CUES[2]))
+    writer.close()
+    writer.close()
+    assert path.read_text(encoding="utf-8").count("-->") == 3
+    
+    
+def test_output_paths():
+    assert output_paths("/out/a.vtt", ("srt", "vtt")) == {"srt": "/out/a.srt", "vtt": "/out/a.vtt"}
+    assert output_paths("/out/a", ("json",)) == {"json": "/out/a.json"}